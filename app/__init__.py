@@ -1,14 +1,16 @@
 from flask import Flask
 from .config import Config
-from .extensions import db, migrate, login_manager, mail       # <-- added mail here
+from .extensions import db, migrate, login_manager, mail, report_cache, callback_cache       # <-- added mail here
 from .auth import auth_bp
 from .main import main_bp
-from .dash_app import init_dashboard
+from .lazy_dashboard import init_dashboard
 from .admin import admin_bp
+from .aggregates import rebuild_aggregates_command
+from .rollups import rebuild_rollups_command
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__, template_folder="templates")
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
 
     # Ensure template changes are picked up without a full server restart
     # (useful in development and avoids stale templates in some environments)
@@ -19,11 +21,16 @@ def create_app():
     migrate.init_app(app, db)
     login_manager.init_app(app)
     mail.init_app(app)     # <-- add this line
+    report_cache.init_app(app)
+    callback_cache.init_app(app)
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(admin_bp)
 
+    app.cli.add_command(rebuild_aggregates_command)
+    app.cli.add_command(rebuild_rollups_command)
+
     init_dashboard(app)
 
     return app
\ No newline at end of file
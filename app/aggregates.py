@@ -0,0 +1,160 @@
+"""
+Aggregates Module for PCOS Monitor System
+Keeps the profile_aggregates table in step with academic and survey writes.
+
+Writers call record_academic() / record_surveys() in the same transaction
+as the rows they add, so per-profile means can be read from one row
+instead of scanning raw records. rebuild() recomputes the table from the
+raw tables and reports any drift it finds.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, func, update
+
+from .extensions import db
+from .models import AcademicRecord, SurveyResponse, ProfileAggregate
+from .queries import ACADEMIC_METRICS, SURVEY_METRICS
+from .summary_tables import ensure_rows, rebuild_command, rebuild_table
+
+# Record kind -> (count column, last-seen column, timestamp column, metrics)
+KINDS = {
+    "academic": ("academic_count", "last_academic_at", AcademicRecord.created_at, ACADEMIC_METRICS),
+    "survey": ("survey_count", "last_survey_at", SurveyResponse.date, SURVEY_METRICS),
+}
+
+
+def _counter_columns(kind):
+    """Columns incremented for one record kind."""
+    count_column, _, _, metrics = KINDS[kind]
+    return [count_column] + [f"{metric}_{part}" for metric in metrics for part in ("sum", "count")]
+
+
+def _deltas(kind, rows):
+    """
+    Per-profile increments for a batch of new records.
+
+    Args:
+        kind (str): "academic" or "survey"
+        rows (iterable): Model instances or dicts with the model's column names
+
+    Returns:
+        dict: profile_id -> {column: increment, last-seen column: latest timestamp}
+    """
+    count_column, last_column, timestamp, metrics = KINDS[kind]
+    deltas = {}
+
+    for row in rows:
+        get = row.get if isinstance(row, dict) else (lambda key, row=row: getattr(row, key, None))
+        delta = deltas.get(get("profile_id"))
+        if delta is None:
+            delta = deltas[get("profile_id")] = dict.fromkeys(_counter_columns(kind), 0)
+            delta[last_column] = None
+
+        delta[count_column] += 1
+        seen = get(timestamp.key)
+        if seen is not None and (delta[last_column] is None or seen > delta[last_column]):
+            delta[last_column] = seen
+
+        # Zero and missing values are skipped, like queries.nonzero_avg
+        for metric, column in metrics.items():
+            value = get(column.key)
+            if value:
+                delta[f"{metric}_sum"] += value
+                delta[f"{metric}_count"] += 1
+
+    return deltas
+
+
+def _apply(kind, deltas):
+    """Add increments to the aggregate rows with one executemany UPDATE."""
+    if not deltas:
+        return
+
+    table = ProfileAggregate.__table__
+    ensure_rows(table, ["profile_id"], deltas)
+    _, last_column, _, _ = KINDS[kind]
+    last = table.c[last_column]
+    seen = bindparam("b_last", type_=last.type)
+
+    values = {name: table.c[name] + bindparam(f"b_{name}") for name in _counter_columns(kind)}
+    values[last_column] = case((last.is_(None) | (last < seen), seen), else_=last)
+    values["updated_at"] = datetime.utcnow()
+    statement = update(table).where(table.c.profile_id == bindparam("b_profile_id")).values(values)
+
+    db.session.execute(statement, [
+        {"b_profile_id": profile_id, "b_last": delta[last_column],
+         **{f"b_{name}": delta[name] for name in _counter_columns(kind)}}
+        for profile_id, delta in deltas.items()
+    ])
+
+
+def record_academic(records):
+    """
+    Fold new academic records into their profiles' aggregates.
+
+    Call after the records are flushed (so defaults such as created_at are
+    set) and before the transaction commits.
+
+    Args:
+        records (iterable): AcademicRecord instances or column dicts
+    """
+    _apply("academic", _deltas("academic", records))
+
+
+def record_surveys(responses):
+    """
+    Fold new survey responses into their profiles' aggregates.
+
+    Args:
+        responses (iterable): SurveyResponse instances or column dicts
+    """
+    _apply("survey", _deltas("survey", responses))
+
+
+def compute_aggregates():
+    """
+    Recompute every profile's aggregate values from the raw tables.
+
+    Returns:
+        dict: profile_id -> {column: value} for profiles with any records
+    """
+    rows = {}
+
+    for kind, (count_column, last_column, timestamp, metrics) in KINDS.items():
+        model = timestamp.class_
+        columns = [func.count(model.id), func.max(timestamp)]
+        for column in metrics.values():
+            columns += [func.coalesce(func.sum(func.nullif(column, 0)), 0), func.count(func.nullif(column, 0))]
+
+        for profile_id, count, last, *values in db.session.query(model.profile_id, *columns).group_by(model.profile_id):
+            row = rows.setdefault(profile_id, {})
+            row[count_column] = count
+            row[last_column] = last
+            row.update(zip(_counter_columns(kind)[1:], values))
+
+    return rows
+
+
+def rebuild(write=True):
+    """
+    Recompute the aggregate table from scratch and report drift.
+
+    Args:
+        write (bool): Replace the stored rows with the recomputed ones;
+            False only checks
+
+    Returns:
+        list: Human-readable drift descriptions, empty when in sync
+    """
+    table = ProfileAggregate.__table__
+    columns = [column.name for column in table.columns if column.name not in ("profile_id", "updated_at")]
+    empty = {column: (None if column.startswith("last_") else 0) for column in columns}
+    return rebuild_table(table, ["profile_id"], columns, empty, compute_aggregates(),
+                         lambda profile_id: f"profile {profile_id}", write)
+
+
+rebuild_aggregates_command = rebuild_command(
+    "rebuild-aggregates", "profile_aggregates", rebuild,
+    "Recompute profile_aggregates from academic records and surveys.",
+)
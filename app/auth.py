@@ -1,9 +1,10 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, session
 from flask_login import login_user, logout_user, login_required
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
-from .extensions import db, mail
+from .extensions import db, mail, report_cache
 from .models import User, StudentProfile
+from .identity import BASELINE_SESSION_KEY
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_mail import Message
 
@@ -46,9 +47,12 @@ def register():
         db.session.add(user)
         db.session.commit()
 
+        from .cohort import cohort_statistics, profile_scores
         profile = StudentProfile(user_id=user.id, name=name)
         db.session.add(profile)
         db.session.commit()
+        report_cache.bump_version()
+        cohort_statistics().record_change(None, profile_scores(profile))
 
         flash("Account created — please login.", "success")
         return redirect(url_for("auth.login"))
@@ -73,6 +77,7 @@ def login():
 @login_required
 def logout():
     logout_user()
+    session.pop(BASELINE_SESSION_KEY, None)
     flash("Logged out.", "info")
     return redirect(url_for("main.index"))
 
@@ -0,0 +1,204 @@
+"""
+Report Cache for PCOS Monitor System
+Shares computed report data between requests and gunicorn workers.
+
+Entries live in a small SQLite file next to the application database and
+are keyed by a monotonically increasing data version. Write paths call
+`bump_version()` after committing, which makes every older entry
+unreachable; those entries are then dropped by LRU eviction or when
+their optional TTL runs out.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+
+
+class ReportCache:
+    """
+    SQLite-backed, size-bounded LRU cache keyed by data version.
+
+    Args:
+        app (Flask, optional): Application to configure from
+        config_prefix (str): Prefix of the PATH, MAX_ENTRIES and TTL
+            config keys; also names the default cache file
+        version_source (ReportCache, optional): Cache whose data version
+            this one shares, so one bump_version() invalidates both
+    """
+
+    def __init__(self, app=None, config_prefix="REPORT_CACHE", version_source=None):
+        self.path = None
+        self.max_entries = 32
+        self.ttl = None
+        self.config_prefix = config_prefix
+        self.version_source = version_source
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the cache file location, size bound and default TTL from app config."""
+        prefix = self.config_prefix
+        directory = (os.path.dirname(self.version_source.path) if self.version_source is not None
+                     else app.instance_path)
+        self.path = app.config.get(f"{prefix}_PATH") or os.path.join(directory, f"{prefix.lower()}.sqlite")
+        self.max_entries = app.config.get(f"{prefix}_MAX_ENTRIES", self.max_entries)
+        self.ttl = app.config.get(f"{prefix}_TTL", self.ttl)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL,"
+                " expires_at REAL)"
+            )
+            # Cache files created before TTL support lack the expiry column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "expires_at" not in columns:
+                conn.execute("ALTER TABLE entries ADD COLUMN expires_at REAL")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+
+        app.extensions[prefix.lower()] = self
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits and closes on exit."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def counter(self, key):
+        """Get a named counter shared by all workers; 0 until first bumped."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def bump_counter(self, key):
+        """Advance a named counter for all workers and return its new value."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, 1)"
+                " ON CONFLICT(key) DO UPDATE SET value = value + 1", (key,)
+            )
+            return conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def data_version(self):
+        """Get the current data version shared by all workers."""
+        if self.version_source is not None:
+            return self.version_source.data_version()
+        return self.counter("data_version")
+
+    def bump_version(self):
+        """Invalidate every cached entry by advancing the data version."""
+        if self.version_source is not None:
+            return self.version_source.bump_version()
+        return self.bump_counter("data_version")
+
+    def get(self, name, version=None):
+        """
+        Look up a cached value for a data version.
+
+        Args:
+            name (str): Logical cache key, e.g. "report_data"
+            version (int, optional): Data version to read; defaults to the
+                current version
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if version is None:
+            version = self.data_version()
+        key = f"{name}@{version}"
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def set(self, name, value, version=None, ttl=None):
+        """
+        Store a value for a data version, evicting expired and least recently used entries.
+
+        Args:
+            name (str): Logical cache key
+            value: Any picklable value
+            version (int, optional): Data version the value was computed from;
+                defaults to the current version
+            ttl (float, optional): Seconds the entry stays valid; defaults to
+                the configured TTL, which is None (no expiry) unless set
+        """
+        if version is None:
+            version = self.data_version()
+        if ttl is None:
+            ttl = self.ttl
+        key = f"{name}@{version}"
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_access, expires_at) VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now,
+                 None if ttl is None else now + ttl)
+            )
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM entries WHERE key NOT IN ("
+                " SELECT key FROM entries ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def get_or_compute(self, name, compute, ttl=None):
+        """
+        Return the cached value for name, computing and storing it on a miss.
+
+        The data version is read before computing, so a write that lands
+        mid-computation leaves the result filed under the older version.
+        None results are returned but not stored.
+        """
+        version = self.data_version()
+        value = self.get(name, version=version)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(name, value, version=version, ttl=ttl)
+        return value
+
+    def memoize(self, name, ttl=None):
+        """
+        Decorator caching a function's result per arguments and data version.
+
+        Arguments are hashed through their JSON form (falling back to str),
+        so they should be plain values such as callback inputs.
+
+        Args:
+            name (str): Key prefix for the function's entries
+            ttl (float, optional): Seconds each result stays valid
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+                digest = hashlib.sha256(arguments.encode()).hexdigest()
+                return self.get_or_compute(f"{name}:{digest}", lambda: func(*args, **kwargs), ttl=ttl)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """Drop every cached entry without changing the data version."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
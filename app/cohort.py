@@ -0,0 +1,197 @@
+"""
+Cohort Statistics Module for PCOS Monitor System
+Cohort means and percentile ranks for the composite baseline scores.
+
+Each worker keeps, per composite score, the sorted list of every
+profile's score and its running sum, plus the number of profiles. Means
+(with or without the viewing student) are then O(1) and a percentile rank
+is two binary searches. The lists are loaded with one three-column query
+the first time they are needed.
+
+Write paths report profile changes through record_change(), which
+updates this worker's lists in place and advances the shared
+"cohort_version" counter in the report cache. Other workers see the new
+counter on their next read and reload, so a survey submission (which
+does not touch composite scores) never forces a reload.
+"""
+
+import bisect
+import math
+import threading
+
+from flask import current_app
+
+from .extensions import db, report_cache
+from .models import StudentProfile
+
+# Composite scores tracked by the service -> StudentProfile column
+COHORT_METRICS = {
+    "awareness": "pcos_awareness_score",
+    "academic_pressure": "academic_pressure_score",
+    "symptoms": "pcos_symptoms_score",
+}
+
+# Shared counter (in the report cache's meta table) advanced on every composite change
+COHORT_VERSION_KEY = "cohort_version"
+
+
+def profile_scores(profile):
+    """
+    Composite scores of a profile, keyed like COHORT_METRICS.
+
+    Missing and zero scores come back as None; they are left out of the
+    cohort, as the dashboard always did.
+    """
+    return {metric: getattr(profile, column) or None for metric, column in COHORT_METRICS.items()}
+
+
+class CohortStatistics:
+    """Per-worker sorted scores and sums for each composite metric."""
+
+    def __init__(self):
+        self._scores = None
+        self._sums = None
+        self._profiles = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read every profile's composite scores with one projection query."""
+        version = report_cache.counter(COHORT_VERSION_KEY)
+        columns = [getattr(StudentProfile, column) for column in COHORT_METRICS.values()]
+        rows = db.session.query(*columns).all()
+
+        scores = {}
+        for metric, values in zip(COHORT_METRICS, zip(*rows) if rows else [()] * len(COHORT_METRICS)):
+            scores[metric] = sorted(value for value in values if value)
+        self._scores = scores
+        self._sums = {metric: math.fsum(values) for metric, values in scores.items()}
+        self._profiles = len(rows)
+        self._version = version
+
+    def _current(self):
+        """Make sure the lists reflect the latest shared cohort version."""
+        version = report_cache.counter(COHORT_VERSION_KEY)
+        if self._scores is None or self._version != version:
+            with self._lock:
+                if self._scores is None or self._version != version:
+                    self._load()
+
+    def record_change(self, before, after):
+        """
+        Apply one committed profile change and notify the other workers.
+
+        Call after the commit. Either side may be None for a created or
+        deleted profile.
+
+        Args:
+            before (dict): profile_scores() before the change, or None
+            after (dict): profile_scores() after the change, or None
+        """
+        with self._lock:
+            version = report_cache.bump_counter(COHORT_VERSION_KEY)
+            if self._scores is None or self._version != version - 1:
+                # Another worker changed the cohort too; reload on the next read
+                self._scores = None
+                return
+
+            for metric in COHORT_METRICS:
+                old = (before or {}).get(metric)
+                new = (after or {}).get(metric)
+                if old == new:
+                    continue
+                values = self._scores[metric]
+                if old is not None:
+                    position = bisect.bisect_left(values, old)
+                    if position < len(values) and values[position] == old:
+                        del values[position]
+                        self._sums[metric] -= old
+                if new is not None:
+                    bisect.insort(values, new)
+                    self._sums[metric] += new
+            self._profiles += (after is not None) - (before is not None)
+            self._version = version
+
+    def invalidate(self):
+        """Force every worker to reload, e.g. after a bulk import of profiles."""
+        with self._lock:
+            report_cache.bump_counter(COHORT_VERSION_KEY)
+            self._scores = None
+
+    def mean(self, metric, exclude=None):
+        """
+        Cohort mean of a composite score.
+
+        Args:
+            metric (str): Key of COHORT_METRICS
+            exclude (float, optional): The viewer's own score, left out of the mean
+
+        Returns:
+            float: Mean, or None when no other profile has the score
+        """
+        self._current()
+        return self._mean(metric, exclude)
+
+    def _mean(self, metric, exclude=None):
+        total, count = self._sums[metric], len(self._scores[metric])
+        if exclude:
+            total, count = total - exclude, count - 1
+        return total / count if count > 0 else None
+
+    def percentile(self, metric, value, exclude_self=True):
+        """
+        Percentile rank of a score among the cohort's scores.
+
+        Ties count as half below, so the median student sits at the 50th
+        percentile.
+
+        Args:
+            metric (str): Key of COHORT_METRICS
+            value (float): The score to rank
+            exclude_self (bool): value belongs to a profile in the cohort
+                and should not be compared with itself
+
+        Returns:
+            int: Rank from 0 to 100, or None without a score or a cohort
+        """
+        self._current()
+        return self._percentile(metric, value, exclude_self)
+
+    def _percentile(self, metric, value, exclude_self=True):
+        if not value:
+            return None
+        values = self._scores[metric]
+        below = bisect.bisect_left(values, value)
+        equal = bisect.bisect_right(values, value) - below
+        count = len(values)
+        if exclude_self:
+            equal, count = equal - 1, count - 1
+        if count <= 0:
+            return None
+        return round(100 * (below + 0.5 * equal) / count)
+
+    def summary(self, profile):
+        """
+        Dashboard cohort comparison for one profile, without the profile itself.
+
+        Returns:
+            dict: cohort_size, avg_<metric> rounded to 2 decimals, and
+                percentiles (metric -> rank or None)
+        """
+        self._current()
+        own = profile_scores(profile)
+        stats = {"cohort_size": max(self._profiles - 1, 0), "percentiles": {}}
+        for metric in COHORT_METRICS:
+            mean = self._mean(metric, exclude=own[metric])
+            stats[f"avg_{metric}"] = None if mean is None else round(mean, 2)
+            stats["percentiles"][metric] = self._percentile(metric, own[metric])
+        return stats
+
+
+def cohort_statistics(app=None):
+    """Get the application's cohort statistics service, creating it on first use."""
+    app = app or current_app
+    service = app.extensions.get("cohort_statistics")
+    if service is None:
+        service = app.extensions.setdefault("cohort_statistics", CohortStatistics())
+    return service
@@ -10,6 +10,34 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///pcos_dev.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Report cache (shared across workers; defaults to instance/report_cache.sqlite)
+    REPORT_CACHE_PATH = os.environ.get("REPORT_CACHE_PATH")
+    REPORT_CACHE_MAX_ENTRIES = int(os.environ.get("REPORT_CACHE_MAX_ENTRIES", "32"))
+
+    # Dash callback cache (next to the report cache, sharing its data version)
+    CALLBACK_CACHE_PATH = os.environ.get("CALLBACK_CACHE_PATH")
+    CALLBACK_CACHE_MAX_ENTRIES = int(os.environ.get("CALLBACK_CACHE_MAX_ENTRIES", "256"))
+    CALLBACK_CACHE_TTL = int(os.environ.get("CALLBACK_CACHE_TTL", "300"))
+
+    # Logged-in user and profile are cached per worker for this long
+    IDENTITY_CACHE_SECONDS = int(os.environ.get("IDENTITY_CACHE_SECONDS", "30"))
+
+    # Background imports (uploads wait in instance/uploads by default)
+    IMPORT_JOB_WORKERS = int(os.environ.get("IMPORT_JOB_WORKERS", "2"))
+    IMPORT_UPLOAD_DIR = os.environ.get("IMPORT_UPLOAD_DIR")
+
+    # Bootstrap CIs in reports (processes=0 runs in-process)
+    BOOTSTRAP_RESAMPLES = int(os.environ.get("BOOTSTRAP_RESAMPLES", "10000"))
+    BOOTSTRAP_SEED = int(os.environ.get("BOOTSTRAP_SEED", "2024"))
+    BOOTSTRAP_PROCESSES = int(os.environ.get("BOOTSTRAP_PROCESSES", "0"))
+
+    # Permutation tests across diagnosis groups in reports
+    PERMUTATION_RESAMPLES = int(os.environ.get("PERMUTATION_RESAMPLES", "10000"))
+    PERMUTATION_SEED = int(os.environ.get("PERMUTATION_SEED", "2024"))
+
+    # Dash dashboard polls for new survey rows this often
+    DASHBOARD_REFRESH_SECONDS = int(os.environ.get("DASHBOARD_REFRESH_SECONDS", "60"))
+
     # Mail
     MAIL_SERVER = os.environ.get("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.environ.get("MAIL_PORT", "587"))
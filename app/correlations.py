@@ -0,0 +1,261 @@
+"""
+Correlation Module for PCOS Monitor System
+Spearman and Pearson matrices with pairwise-complete counts and p-values.
+
+Variables are grouped by their missing-value pattern and each group pair
+is ranked and correlated in one pass as a matrix product. When every
+variable is observed for the same profiles that is a single pass over the
+whole frame; otherwise each block still sees exactly the rows where both
+of its variables are present, as scipy's spearmanr on a dropna'd pair would.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+from scipy.stats import t as t_dist
+
+from . import queries
+from .extensions import report_cache
+
+# Profile-level variables from queries.profile_feature_frame()
+CORRELATION_VARIABLES = [
+    "awareness", "academic_pressure", "symptoms",
+    "gpa", "attendance", "study_hours",
+    "fatigue", "mood", "sleep", "stress",
+]
+
+METHODS = ("spearman", "pearson")
+
+# Resample x observation cells materialized per bootstrap batch
+BOOTSTRAP_BATCH_CELLS = 2_000_000
+
+
+class CorrelationMatrix:
+    """
+    Full correlation matrices over a set of variables.
+
+    Attributes:
+        variables (list): Variable names in matrix order
+        n (pd.DataFrame): Pairwise-complete sample counts
+        r (dict): Coefficient matrix per method
+        p (dict): Two-sided p-value matrix per method
+    """
+
+    def __init__(self, variables, n, r, p):
+        self.variables = variables
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def pair(self, x, y, method="spearman"):
+        """
+        Look up one variable pair.
+
+        Returns:
+            tuple: (coefficient, p-value, n)
+        """
+        return self.r[method].at[x, y], self.p[method].at[x, y], int(self.n.at[x, y])
+
+
+def _unit_columns(values):
+    """Center each column and scale it to unit length; constant columns become NaN."""
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return centered / norms
+
+
+def _p_values(r, n):
+    """Two-sided p-values for correlation coefficients from the t distribution."""
+    dof = n - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_stat = r * np.sqrt(dof / ((1 - r) * (1 + r)))
+        p = 2 * t_dist.sf(np.abs(t_stat), dof)
+    p[dof <= 0] = np.nan
+    return p
+
+
+def correlate(frame, variables=None):
+    """
+    Compute Spearman and Pearson matrices for every pair of variables.
+
+    Args:
+        frame (pd.DataFrame): One row per observation
+        variables (list, optional): Columns to correlate; defaults to
+            CORRELATION_VARIABLES present in the frame
+
+    Returns:
+        CorrelationMatrix: Coefficients, p-values and counts
+    """
+    if variables is None:
+        variables = [name for name in CORRELATION_VARIABLES if name in frame.columns]
+
+    data = frame[variables].astype(float)
+    present = data.notna()
+    size = len(variables)
+    position = {name: i for i, name in enumerate(variables)}
+
+    # Variables observed for exactly the same rows share one block
+    patterns = {}
+    for name in variables:
+        patterns.setdefault(present[name].to_numpy().tobytes(), []).append(name)
+    groups = list(patterns.values())
+
+    n = np.zeros((size, size))
+    r = {method: np.full((size, size), np.nan) for method in METHODS}
+
+    for a, first in enumerate(groups):
+        for second in groups[a:]:
+            same = second is first
+            columns = first if same else first + second
+            rows = present[first[0]].to_numpy() & present[second[0]].to_numpy()
+            block = data.loc[rows, columns].to_numpy()
+
+            # Diagonal blocks fill their square; cross blocks only the off-diagonal part
+            left = [position[name] for name in first]
+            right = left if same else [position[name] for name in second]
+            cells = np.ix_(left, right)
+            mirror = np.ix_(right, left)
+            take = slice(None) if same else slice(len(first), None)
+
+            n[cells] = n[mirror] = len(block)
+            if len(block) < 2:
+                continue
+
+            for method, values in (("pearson", block), ("spearman", rankdata(block, axis=0))):
+                unit = _unit_columns(values)
+                coefficients = np.clip(unit[:, :len(first)].T @ unit[:, take], -1, 1)
+                r[method][cells] = coefficients
+                r[method][mirror] = coefficients.T
+
+    def as_frame(matrix):
+        return pd.DataFrame(matrix, index=variables, columns=variables)
+
+    return CorrelationMatrix(
+        variables,
+        as_frame(n),
+        {method: as_frame(r[method]) for method in METHODS},
+        {method: as_frame(_p_values(r[method], n)) for method in METHODS},
+    )
+
+
+def cohort_correlations(features=None):
+    """
+    Correlations over the profile feature frame, cached per data version.
+
+    Args:
+        features (pd.DataFrame, optional): Already loaded
+            queries.profile_feature_frame(), used on a cache miss
+
+    Returns:
+        CorrelationMatrix: Shared result for reports and admin pages
+    """
+    def compute():
+        return correlate(queries.profile_feature_frame() if features is None else features)
+
+    return report_cache.get_or_compute("correlations", compute)
+
+
+def _resample_weights(rng, n, size):
+    """Bootstrap draw counts: row i holds how often resample i picked each observation."""
+    picks = rng.integers(0, n, (size, n), dtype=np.int32) + (np.arange(size, dtype=np.int32) * n)[:, None]
+    return np.bincount(picks.ravel(), minlength=size * n).reshape(size, n).astype(float)
+
+
+def _weighted_midranks(values, weights):
+    """
+    Average ranks of every observation within every weighted resample.
+
+    A resample's ranks depend only on how often each original value was
+    drawn, so one argsort of the original values serves all resamples:
+    per-value draw counts are summed over tied values and cumulated.
+
+    Args:
+        values (np.ndarray): Original observations, shape (n,)
+        weights (np.ndarray): Draw counts, shape (resamples, n)
+
+    Returns:
+        np.ndarray: Midranks, shape (resamples, n)
+    """
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    new_value = np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+
+    tie_group = np.empty(len(values), dtype=np.intp)
+    tie_group[order] = np.cumsum(new_value) - 1
+
+    group_weights = np.add.reduceat(weights[:, order], np.flatnonzero(new_value), axis=1)
+    midranks = np.cumsum(group_weights, axis=1) - (group_weights - 1) / 2
+    return midranks[:, tie_group]
+
+
+def _weighted_correlations(weights, a, b):
+    """Pearson correlation of a and b under each row of bootstrap weights."""
+    total = weights.sum(axis=1)
+    weighted_a = weights * a
+    weighted_b = weights * b
+    sum_a = weighted_a.sum(axis=1)
+    sum_b = weighted_b.sum(axis=1)
+
+    cov = np.einsum("ij,ij->i", weighted_a, b) - sum_a * sum_b / total
+    var_a = np.einsum("ij,ij->i", weighted_a, a) - sum_a ** 2 / total
+    var_b = np.einsum("ij,ij->i", weighted_b, b) - sum_b ** 2 / total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.clip(cov / np.sqrt(var_a * var_b), -1, 1)
+
+
+def _bootstrap_batch(x, y, method, size, seed):
+    """Correlation coefficients for one batch of resamples."""
+    weights = _resample_weights(np.random.default_rng(seed), len(x), size)
+    if method == "spearman":
+        return _weighted_correlations(weights, _weighted_midranks(x, weights), _weighted_midranks(y, weights))
+    shape = weights.shape
+    return _weighted_correlations(weights, np.broadcast_to(x - x.mean(), shape), np.broadcast_to(y - y.mean(), shape))
+
+
+def bootstrap_ci(x, y, method="spearman", n_resamples=10000, confidence=0.95, seed=None, processes=0):
+    """
+    Percentile bootstrap confidence interval for a correlation coefficient.
+
+    Resamples are drawn and evaluated in batches as array operations; each
+    batch gets its own child seed, so a given seed gives the same interval
+    whether batches run in-process or on a process pool.
+
+    Args:
+        x (array-like): First variable, complete cases only
+        y (array-like): Second variable, aligned with x
+        method (str): "spearman" or "pearson"
+        n_resamples (int): Number of bootstrap resamples
+        confidence (float): Interval coverage
+        seed (int, optional): Seed for reproducible intervals
+        processes (int): Worker processes for the batches; 0 runs in-process
+
+    Returns:
+        tuple: (low, high), NaN when there are fewer than 3 observations
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) < 3 or n_resamples < 1:
+        return np.nan, np.nan
+
+    batch = max(1, BOOTSTRAP_BATCH_CELLS // len(x))
+    sizes = [min(batch, n_resamples - start) for start in range(0, n_resamples, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if processes and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_bootstrap_batch, repeat(x), repeat(y), repeat(method), sizes, seeds))
+    else:
+        results = [_bootstrap_batch(x, y, method, size, child) for size, child in zip(sizes, seeds)]
+
+    samples = np.concatenate(results)
+    samples = samples[~np.isnan(samples)]
+    if not len(samples):
+        return np.nan, np.nan
+
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(samples, [tail, 100 - tail])
+    return low, high
@@ -1,12 +1,147 @@
+"""
+Dashboard Module for PCOS Monitor System
+The Plotly Dash analytics dashboard served under /dashboard/.
+
+Importing this module loads dash, plotly and pandas, so create_app never
+does: app/lazy_dashboard.py builds the dashboard on the first request
+under /dashboard/ (see create_dashboard).
+"""
+
 import dash
-from dash import html, dcc, Input, Output
-import plotly.express as px
-import plotly.graph_objects as go
+from dash import html, dcc, Input, Output, State
+from flask import Flask
 import pandas as pd
+from .extensions import callback_cache
 from .models import SurveyResponse
+from .downsample import SERIES_MAX_POINTS, WEBGL_MIN_POINTS, lttb
+from .queries import survey_cursor, survey_date_range, survey_value_counts, series_statistics
+
+# Survey metrics loaded into the dashboard's series store
+DASHBOARD_METRICS = ["fatigue", "mood_swings", "perceived_academic_stress"]
+
+# Widest visible span (in days) drawn at each resolution; wider ranges are monthly
+SERIES_RESOLUTIONS = [(120, "day"), (1100, "week")]
+
+
+def series_resolution(start, end):
+    """Pick the series resolution for a visible date range."""
+    span = (pd.Timestamp(end) - pd.Timestamp(start)).days
+    for max_days, resolution in SERIES_RESOLUTIONS:
+        if span <= max_days:
+            return resolution
+    return "month"
+
+
+def visible_range(relayout_data):
+    """
+    Visible x-axis range from a graph's relayoutData.
+
+    Returns:
+        tuple: (start, end) timestamps when the user zoomed or panned,
+            None for the full range or when the x-axis did not change
+    """
+    relayout_data = relayout_data or {}
+    if "xaxis.range[0]" in relayout_data and "xaxis.range[1]" in relayout_data:
+        return pd.Timestamp(relayout_data["xaxis.range[0]"]), pd.Timestamp(relayout_data["xaxis.range[1]"])
+    if "xaxis.range" in relayout_data:
+        return tuple(pd.Timestamp(value) for value in relayout_data["xaxis.range"])
+    return None
+
+
+def _counts_from_json(data):
+    return pd.DataFrame({"period": pd.to_datetime(data["period"]), "value": data["value"], "count": data["count"]})
+
+
+def _series_entry(counts):
+    """Store entry for one metric: its value counts plus the statistics drawn from them."""
+    statistics = series_statistics(counts)
+    if len(statistics) > SERIES_MAX_POINTS:
+        statistics = statistics.iloc[lttb(statistics.index.asi8, statistics["mean"], SERIES_MAX_POINTS)]
+    return {
+        "counts": {
+            "period": counts["period"].dt.strftime("%Y-%m-%d").tolist(),
+            "value": counts["value"].tolist(),
+            "count": counts["count"].tolist(),
+        },
+        "series": {
+            "x": statistics.index.strftime("%Y-%m-%d").tolist(),
+            **{name: statistics[name].tolist() for name in statistics.columns},
+            "webgl": len(statistics) >= WEBGL_MIN_POINTS,
+        },
+    }
+
+
+def load_series(window=None):
+    """
+    Build the series store for every dashboard metric.
+
+    Args:
+        window (tuple, optional): Visible (start, end); None for all data
+
+    Returns:
+        dict: cursor (highest survey id included), resolution, window and
+            per-metric counts and statistics; metrics is empty without surveys
+    """
+    first, last = survey_date_range()
+    cursor = survey_cursor()
+    if first is None:
+        return {"cursor": cursor, "resolution": None, "window": None, "metrics": {}}
+
+    start, end = window or (None, None)
+    resolution = series_resolution(*(window or (first, last)))
+    return {
+        "cursor": cursor,
+        "resolution": resolution,
+        "window": [start.isoformat(), end.isoformat()] if window else None,
+        "metrics": {
+            metric: _series_entry(survey_value_counts(
+                getattr(SurveyResponse, metric), resolution, start, end, up_to_id=cursor))
+            for metric in DASHBOARD_METRICS
+        },
+    }
+
+
+def refresh_series(store):
+    """
+    Merge surveys added since the store's cursor into its counts.
+
+    Returns:
+        dict: Updated store, or None when there are no new surveys
+    """
+    cursor = survey_cursor()
+    if cursor <= store["cursor"]:
+        return None
+    if not store["metrics"]:
+        return load_series()
 
-def init_dashboard(server):
-    dash_app = dash.Dash(__name__, server=server, url_base_pathname="/dashboard/",
+    start, end = (pd.Timestamp(value) for value in store["window"]) if store["window"] else (None, None)
+    metrics = {}
+    for metric, entry in store["metrics"].items():
+        new = survey_value_counts(getattr(SurveyResponse, metric), store["resolution"], start, end,
+                                  after_id=store["cursor"], up_to_id=cursor)
+        counts = pd.concat([_counts_from_json(entry["counts"]), new])
+        metrics[metric] = _series_entry(counts.groupby(["period", "value"])["count"].sum().reset_index())
+
+    return {**store, "cursor": cursor, "metrics": metrics}
+
+
+def create_dashboard(app):
+    """
+    Build the Dash app on its own Flask server.
+
+    The main app has usually served requests by the time the dashboard is
+    first opened, and Flask no longer accepts new routes then, so Dash
+    gets a private server that LazyDashboard forwards /dashboard/ requests
+    to after running the main app's before-request hooks. Server callbacks
+    push the main app's context for database access.
+
+    Args:
+        app (Flask): The main application
+
+    Returns:
+        dash.Dash: The dashboard; its WSGI entry point is dash_app.server
+    """
+    dash_app = dash.Dash(__name__, server=Flask(__name__), url_base_pathname="/dashboard/",
                          suppress_callback_exceptions=True)
 
     # Define the color palette matching the website theme
@@ -99,7 +234,10 @@ def init_dashboard(server):
                         'modeBarButtonsToRemove': ['lasso2d', 'select2d']
                     },
                     style={'height': '500px'}
-                )
+                ),
+                # Aggregated series for every metric; the dropdown only redraws from it
+                dcc.Store(id="series-store"),
+                dcc.Interval(id="series-refresh", interval=app.config.get("DASHBOARD_REFRESH_SECONDS", 60) * 1000)
             ], style={
                 'background': '#ffffff',
                 'padding': '1.5rem',
@@ -142,108 +280,122 @@ def init_dashboard(server):
         'fontFamily': '-apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif'
     })
 
-    @dash_app.callback(Output("time-series", "figure"), Input("metric-select", "value"))
-    def update_time_series(metric):
-        responses = SurveyResponse.query.all()
-
-        if not responses:
-            # Create empty figure with custom styling
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No data available yet. Submit your first survey response!",
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=0.5,
-                showarrow=False,
-                font=dict(size=16, color=MUTED)
-            )
-            fig.update_layout(
-                title={
-                    'text': "No Data Yet",
-                    'font': {'size': 20, 'color': NAVY, 'family': 'inherit'},
-                    'x': 0.5,
-                    'xanchor': 'center'
-                },
-                xaxis={'visible': False},
-                yaxis={'visible': False},
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                height=500
-            )
-            return fig
-        
-        df = pd.DataFrame([{
-            "date": r.date,
-            "fatigue": r.fatigue,
-            "mood_swings": r.mood_swings,
-            "perceived_academic_stress": r.perceived_academic_stress
-        } for r in responses])
-
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values(by='date')
-        df.rename(columns={"date": "Date", metric: "Value"}, inplace=True)
-
-        # Determine color based on metric
-        metric_colors = {
-            'fatigue': PILL_RED,
-            'mood_swings': PILL_YELLOW,
-            'perceived_academic_stress': PILL_BLUE
+    # Popular views (the full range, the same refresh tick) are computed once
+    # per data version and then served to every worker from the callback cache
+    cached_load_series = callback_cache.memoize("dash:load_series")(load_series)
+    cached_refresh_series = callback_cache.memoize("dash:refresh_series")(refresh_series)
+
+    @dash_app.callback(Output("series-store", "data"),
+                       Input("time-series", "relayoutData"),
+                       Input("series-refresh", "n_intervals"),
+                       State("series-store", "data"))
+    def update_series(relayout_data, n_intervals, store):
+        triggered = [t["prop_id"] for t in dash.callback_context.triggered]
+
+        with app.app_context():
+            # Timer ticks only fetch surveys newer than the store's cursor
+            if "series-refresh.n_intervals" in triggered and store is not None:
+                refreshed = cached_refresh_series(store)
+                return dash.no_update if refreshed is None else refreshed
+
+            # Only zooms, pans and autorange resets of the x-axis need a new range
+            if "time-series.relayoutData" in triggered and not any(key.startswith("xaxis") for key in relayout_data or {}):
+                return dash.no_update
+
+            return cached_load_series(visible_range(relayout_data))
+
+    # Metric switches redraw from the store in the browser, with no server round-trip
+    dash_app.clientside_callback(
+        """
+        function(store, metric) {
+            if (!store) {
+                return window.dash_clientside.no_update;
+            }
+            // Palette from init_dashboard
+            const NAVY = '#0B1D39', TEXT = '#1C1F26', MUTED = '#6B7280';
+            const colors = {
+                fatigue: '#dc3545',
+                mood_swings: '#f6c744',
+                perceived_academic_stress: '#0d6efd'
+            };
+            const entry = store.metrics[metric];
+
+            if (!entry) {
+                return {
+                    data: [],
+                    layout: {
+                        title: {text: 'No Data Yet', font: {size: 20, color: NAVY, family: 'inherit'}, x: 0.5, xanchor: 'center'},
+                        annotations: [{
+                            text: 'No data available yet. Submit your first survey response!',
+                            xref: 'paper', yref: 'paper', x: 0.5, y: 0.5, showarrow: false,
+                            font: {size: 16, color: MUTED}
+                        }],
+                        xaxis: {visible: false},
+                        yaxis: {visible: false},
+                        plot_bgcolor: 'white',
+                        paper_bgcolor: 'white',
+                        height: 500
+                    }
+                };
+            }
+
+            const series = entry.series;
+            const color = colors[metric] || '#0d6efd';
+            const rgb = [1, 3, 5].map(i => parseInt(color.slice(i, i + 2), 16)).join(', ');
+            const name = metric.split('_').map(w => w.charAt(0).toUpperCase() + w.slice(1)).join(' ');
+            const period = {day: 'Daily', week: 'Weekly', month: 'Monthly'}[store.resolution];
+            const customdata = series.n.map((n, i) => [n, series.q1[i], series.q3[i]]);
+            const type = series.webgl ? 'scattergl' : 'scatter';
+
+            const xaxis = {
+                title: {text: 'Date', font: {size: 14, color: TEXT}},
+                gridcolor: '#f0f0f0', showgrid: true, zeroline: false
+            };
+            if (store.window) {
+                xaxis.range = store.window;
+            }
+
+            return {
+                // Interquartile band, median and mean per period
+                data: [
+                    {x: series.x, y: series.q3, type: type, mode: 'lines', line: {width: 0},
+                     showlegend: false, hoverinfo: 'skip'},
+                    {x: series.x, y: series.q1, type: type, mode: 'lines', line: {width: 0},
+                     fill: 'tonexty', fillcolor: 'rgba(' + rgb + ', 0.15)',
+                     name: 'Interquartile range', hoverinfo: 'skip'},
+                    {x: series.x, y: series.median, type: type, mode: 'lines+markers', name: 'Median',
+                     line: {color: color, width: 3},
+                     marker: {size: 6, color: color, line: {color: 'white', width: 1}},
+                     customdata: customdata,
+                     hovertemplate: 'Median %{y}<br>IQR %{customdata[1]}–%{customdata[2]}<br>n = %{customdata[0]}<extra></extra>'},
+                    {x: series.x, y: series.mean, type: type, mode: 'lines', name: 'Mean',
+                     line: {color: NAVY, width: 2, dash: 'dot'},
+                     hovertemplate: 'Mean %{y:.2f}<extra></extra>'}
+                ],
+                layout: {
+                    title: {text: name + ' Over Time (' + period + ')',
+                            font: {size: 22, color: NAVY, family: 'inherit'}, x: 0, xanchor: 'left'},
+                    xaxis: xaxis,
+                    yaxis: {
+                        title: {text: 'Value', font: {size: 14, color: TEXT}},
+                        gridcolor: '#f0f0f0', showgrid: true, zeroline: false
+                    },
+                    plot_bgcolor: 'white',
+                    paper_bgcolor: 'white',
+                    hovermode: 'x unified',
+                    hoverlabel: {bgcolor: NAVY, font: {size: 13, family: 'inherit'}},
+                    margin: {l: 60, r: 30, t: 60, b: 60},
+                    height: 500,
+                    // Keep the user's zoom across redraws and metric switches
+                    uirevision: 'time-series'
+                }
+            };
         }
-        line_color = metric_colors.get(metric, PILL_BLUE)
-
-        # Create enhanced line chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=df['Date'],
-            y=df['Value'],
-            mode='lines+markers',
-            name=metric.replace('_', ' ').title(),
-            line=dict(color=line_color, width=3),
-            marker=dict(size=8, color=line_color, line=dict(color='white', width=2)),
-            fill='tozeroy',
-            fillcolor=f'rgba({int(line_color[1:3], 16)}, {int(line_color[3:5], 16)}, {int(line_color[5:7], 16)}, 0.1)'
-        ))
-
-        fig.update_layout(
-            title={
-                'text': f"{metric.replace('_', ' ').title()} Over Time",
-                'font': {'size': 22, 'color': NAVY, 'family': 'inherit'},
-                'x': 0,
-                'xanchor': 'left'
-            },
-            xaxis={
-                'title': {
-                    'text': 'Date',
-                    'font': {'size': 14, 'color': TEXT}
-                },
-                'gridcolor': '#f0f0f0',
-                'showgrid': True,
-                'zeroline': False
-            },
-            yaxis={
-                'title': {
-                    'text': 'Value',
-                    'font': {'size': 14, 'color': TEXT}
-                },
-                'gridcolor': '#f0f0f0',
-                'showgrid': True,
-                'zeroline': False
-            },
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            hovermode='x unified',
-            hoverlabel=dict(
-                bgcolor=NAVY,
-                font_size=13,
-                font_family='inherit'
-            ),
-            margin=dict(l=60, r=30, t=60, b=60),
-            height=500
-        )
-
-        return fig
+        """,
+        Output("time-series", "figure"),
+        Input("series-store", "data"),
+        Input("metric-select", "value")
+    )
 
     # Add custom CSS for hover effects
     dash_app.index_string = '''
@@ -0,0 +1,141 @@
+"""
+Downsampling Module for PCOS Monitor System
+Shrinks large chart series on the server before they are serialized.
+
+Time series keep their visual shape through Largest-Triangle-Three-Buckets
+(LTTB); scatter plots beyond a few thousand points are replaced by 2-D
+bins sized by how many profiles fall in each. Traces that are still large
+are flagged for WebGL (Scattergl) rendering.
+"""
+
+import numpy as np
+
+# Points kept per time series after LTTB
+SERIES_MAX_POINTS = 2000
+
+# Scatter plots with more points than this are binned
+SCATTER_MAX_POINTS = 5000
+
+# Bins per axis for binned scatter plots
+SCATTER_BINS = 100
+
+# Traces with at least this many points render with Scattergl
+WEBGL_MIN_POINTS = 1000
+
+
+def lttb(x, y, threshold=SERIES_MAX_POINTS):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into threshold - 2 buckets, and each bucket keeps the point that
+    forms the largest triangle with the previously kept point and the
+    mean of the next bucket. Bucket means come from cumulative sums, so
+    each step is one vectorized pass over its bucket.
+
+    Args:
+        x (array-like): Sorted x values (numbers; convert dates first)
+        y (array-like): y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices into x and y
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    sum_x = np.r_[0.0, np.cumsum(x)]
+    sum_y = np.r_[0.0, np.cumsum(y)]
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_lo, next_hi = hi, edges[bucket + 2]
+            mean_x = (sum_x[next_hi] - sum_x[next_lo]) / (next_hi - next_lo)
+            mean_y = (sum_y[next_hi] - sum_y[next_lo]) / (next_hi - next_lo)
+        else:
+            mean_x, mean_y = x[-1], y[-1]
+
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[anchor] - mean_x) * (y[lo:hi] - y[anchor]) - (x[anchor] - x[lo:hi]) * (mean_y - y[anchor]))
+        anchor = lo + int(np.argmax(area))
+        keep[bucket + 1] = anchor
+
+    return keep
+
+
+def bin_scatter(x, y, bins=SCATTER_BINS):
+    """
+    Aggregate scatter points into a grid of 2-D bins.
+
+    Args:
+        x (array-like): x values without missing entries
+        y (array-like): y values, aligned with x
+        bins (int): Bins per axis
+
+    Returns:
+        tuple: (mean x, mean y, count) per occupied bin
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    def codes(values):
+        low, high = values.min(), values.max()
+        if high == low:
+            return np.zeros(len(values), dtype=np.intp)
+        return np.minimum(((values - low) / (high - low) * bins).astype(np.intp), bins - 1)
+
+    cells, inverse = np.unique(codes(x) * bins + codes(y), return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(cells))
+    return (np.bincount(inverse, weights=x) / counts,
+            np.bincount(inverse, weights=y) / counts,
+            counts)
+
+
+def _trendline(x, y):
+    """OLS line over the full data, as two end points; None when undefined."""
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    ends = np.array([x.min(), x.max()])
+    return {"x": ends.tolist(), "y": (slope * ends + intercept).tolist()}
+
+
+def scatter_payload(x, y, text=None, max_points=SCATTER_MAX_POINTS, bins=SCATTER_BINS):
+    """
+    Chart-ready scatter data, binned when there are too many points.
+
+    Args:
+        x (array-like): x values; NaN pairs are dropped
+        y (array-like): y values, aligned with x
+        text (array-like, optional): Hover text per point
+        max_points (int): Largest point count sent unbinned
+        bins (int): Bins per axis when binning
+
+    Returns:
+        dict: x, y, text or count, binned flag, webgl flag, n (points
+            before binning) and the OLS trend over all points
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    present = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[present], y[present]
+
+    payload = {"n": int(len(x)), "trend": _trendline(x, y)}
+    if len(x) > max_points:
+        bin_x, bin_y, counts = bin_scatter(x, y, bins)
+        payload.update(binned=True, x=bin_x.tolist(), y=bin_y.tolist(), count=counts.tolist())
+    else:
+        payload.update(binned=False, x=x.tolist(), y=y.tolist(),
+                       text=None if text is None else np.asarray(text, dtype=object)[present].tolist())
+
+    payload["webgl"] = len(payload["x"]) >= WEBGL_MIN_POINTS
+    return payload
@@ -0,0 +1,92 @@
+"""
+Export Module for PCOS Monitor System
+Streams dataset tables as CSV in fixed-size batches.
+"""
+
+import csv
+import io
+import zlib
+
+from sqlalchemy import select
+
+from .extensions import db
+from .models import StudentProfile, AcademicRecord, SurveyResponse
+
+# Rows fetched and written per batch; bounds peak memory regardless of table size
+EXPORT_BATCH_SIZE = 1000
+
+# Exportable tables by the name used in the ?table= query parameter
+EXPORT_TABLES = {
+    "surveys": SurveyResponse.__table__,
+    "academic": AcademicRecord.__table__,
+    "profiles": StudentProfile.__table__,
+}
+
+
+def iter_rows(table, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield batches of row tuples from a table using keyset pagination.
+
+    Each batch is a separate `id > last_id ... LIMIT n` query, so neither
+    the database cursor nor Python ever holds more than one batch.
+
+    Args:
+        table (sa.Table): Table to read
+        batch_size (int): Rows per batch
+
+    Yields:
+        list: Row tuples in primary key order
+    """
+    last_id = None
+    while True:
+        query = select(*table.columns).order_by(table.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        batch = db.session.execute(query).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def iter_csv(table, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield a table as CSV text, one chunk per batch.
+
+    Args:
+        table (sa.Table): Table to export
+        batch_size (int): Rows per chunk
+
+    Yields:
+        str: CSV text, starting with the header row
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow([column.name for column in table.columns])
+    for batch in iter_rows(table, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_gzip(chunks):
+    """
+    Gzip-compress a stream of text chunks incrementally.
+
+    Args:
+        chunks (iterable): UTF-8 text chunks
+
+    Yields:
+        bytes: Compressed gzip stream
+    """
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -2,10 +2,13 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_mail import Mail
+from .cache import ReportCache
 
 db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
 mail = Mail()
+report_cache = ReportCache()
+callback_cache = ReportCache(config_prefix="CALLBACK_CACHE", version_source=report_cache)
 
 login_manager.login_view = "auth.login"
\ No newline at end of file
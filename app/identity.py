@@ -0,0 +1,146 @@
+"""
+Identity Module for PCOS Monitor System
+Loads the logged-in user and their profile with one query, cached per worker.
+
+Flask-Login calls the user loader on every request, and require_baseline
+then reads the user's profile. The loader here fetches both in a single
+joined query and keeps their column values in a small per-application
+cache for IDENTITY_CACHE_SECONDS. A cache hit rebuilds the user and
+profile as detached instances and attaches them to the request's
+session, which costs no SQL; lazy relationships and writes behave as if
+the objects had just been queried.
+
+Commits that insert, change or delete a user or profile drop that user's
+entry in this worker and advance a shared identity version in the report
+cache. Every worker reads that version (a small SQLite lookup, not a
+database query) before using an entry, so a user deleted or demoted by
+an admin on another worker loses access on their next request. The TTL
+only bounds staleness for writes that bypass the ORM session.
+"""
+
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .extensions import db, report_cache
+from .models import User, StudentProfile
+
+# Seconds a cached identity is reused before it is read from the database again
+IDENTITY_CACHE_SECONDS = 30
+
+# Report cache counter advanced whenever a user or profile changes
+IDENTITY_VERSION_KEY = "identity_version"
+
+# Session key set once the user's baseline survey is complete; holds their user id
+BASELINE_SESSION_KEY = "baseline_complete"
+
+
+class IdentityCache:
+    """Per-worker map of user id to (expiry, identity version, user columns, profile columns or None)."""
+
+    def __init__(self, ttl=IDENTITY_CACHE_SECONDS):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic() or entry[1] != version:
+            return None
+        return entry[2:]
+
+    def put(self, user_id, version, user_values, profile_values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, version, user_values, profile_values)
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def identity_cache(app=None):
+    """Get the application's identity cache, creating it on first use."""
+    app = app or current_app
+    cache = app.extensions.get("identity_cache")
+    if cache is None:
+        cache = app.extensions.setdefault(
+            "identity_cache", IdentityCache(app.config.get("IDENTITY_CACHE_SECONDS", IDENTITY_CACHE_SECONDS))
+        )
+    return cache
+
+
+def _column_values(instance):
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+def _attach(user_values, profile_values):
+    """Rebuild a user (and profile) from cached columns and add them to the session without a query."""
+    user = User(**user_values)
+    profile = None if profile_values is None else StudentProfile(**profile_values)
+    set_committed_value(user, "profile", profile)
+    make_transient_to_detached(user)
+    if profile is not None:
+        set_committed_value(profile, "user", user)
+        make_transient_to_detached(profile)
+    db.session.add(user)
+    return user
+
+
+def load_identity(user_id):
+    """
+    Get a user with their profile already loaded.
+
+    Args:
+        user_id (int): User primary key
+
+    Returns:
+        User: Attached to the current session, or None if there is no such user
+    """
+    cache = identity_cache()
+    version = report_cache.counter(IDENTITY_VERSION_KEY)
+    cached = cache.get(user_id, version)
+    if cached is not None:
+        # Another lookup in this request may have attached the user already
+        current = db.session.identity_map.get(inspect(User).identity_key_from_primary_key((user_id,)))
+        return current if current is not None else _attach(*cached)
+
+    user = db.session.get(User, user_id, options=[joinedload(User.profile)])
+    if user is None:
+        return None
+    cache.put(user_id, version, _column_values(user), None if user.profile is None else _column_values(user.profile))
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_identity_changes(session, flush_context):
+    """Remember which users' identities a flush touched, to drop them on commit."""
+    changed = session.info.setdefault("identity_changes", set())
+    # Objects dirty only through a collection (e.g. a new survey) keep their identity
+    dirty = [instance for instance in session.dirty if session.is_modified(instance, include_collections=False)]
+    for instance in (*session.new, *dirty, *session.deleted):
+        if isinstance(instance, User):
+            changed.add(instance.id)
+        elif isinstance(instance, StudentProfile):
+            changed.add(instance.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_identity_changes(session):
+    changed = session.info.pop("identity_changes", None)
+    if changed and has_app_context():
+        identity_cache().invalidate(changed)
+        report_cache.bump_counter(IDENTITY_VERSION_KEY)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_identity_changes(session):
+    session.info.pop("identity_changes", None)
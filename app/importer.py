@@ -0,0 +1,274 @@
+"""
+Import Module for PCOS Monitor System
+Column-wise coercion and bulk inserts for survey dataset uploads.
+"""
+
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from .extensions import db
+from .models import User, StudentProfile
+
+# Placeholder password for imported accounts
+IMPORT_PASSWORD = "imported123"
+
+# Minimum columns an upload must provide
+REQUIRED_COLUMNS = ["Age", "Year Level"]
+
+# Long survey question headers -> short column names
+COLUMN_MAPPING = {
+    "Consent To Participate I Have Read And Understood The Information Provided Above About This Research Study. I Voluntarily Agree To Participate, And I Understand That My Participation Is Voluntary, And I May Withdraw At Any Time Without Penalty. My Responses Will Remain Confidential And Will Only Be Used For Academic Purposes. No Personal Identifiers (Such As My Name) Will Appear In The Final Report. The Data I Provide Will Be Protected Under The Data Privacy Act Of 2012 (Ra 10173).": "Consent",
+    "Do You Have A Clinical Diagnosis Of Pcos": "Clinical Diagnosis",
+    "For Clinically Diagnosed, Are You Willing To Undergo A Thorough Interview (If Yes, Leave Your Fb_Email_Contact Number In \"Other\" Section).": "Interview Willing",
+    "If No, Do You Think You May Have Pcos (Based On Symptoms You Experience)": "Suspect PCOS",
+    "I Am Familiar With The Term Polycystic Ovary Syndrome (Pcos).": "Familiar PCOS",
+    "I Know The Common Symptoms Of Pcos. Irregular Periods": "Know Symptoms Irregular",
+    "I Know The Common Symptoms Of Pcos. Acne": "Know Symptoms Acne",
+    "I Know The Common Symptoms Of Pcos. Weight Fluctuations": "Know Symptoms Weight",
+    "I Know The Common Symptoms Of Pcos. Excessive Hair Growth": "Know Symptoms Hair",
+    "I Understand That Pcos Can Affect Both Physical And Mental Health.": "Understand Health Impact",
+    "I Am Aware Of The Possible Treatments_Management Strategies For Pcos.": "Aware Treatments",
+    "I Believe Pcos Can Affect Academic Performance.": "Believe Academic Impact",
+    "I Often Feel Academic Pressure Due To Heavy Workloads.": "Academic Pressure",
+    "Stress From My Academic Environment Affects My Health And Well-Being.": "Stress Affects Health",
+    "Fatigue Or Irregular Sleep Patterns Affect My Ability To Concentrate On Schoolwork.": "Fatigue Affects Concentration",
+    "My Academic Performance Is Sometimes Influenced By My Physical Or Emotional Health.": "Performance Influenced Health",
+    "Professors And School Administrators Are Understanding When Health Issues Affect My Performance.": "School Understanding",
+    "I Sometimes Experience Symptoms (E.G., Fatigue, Irregular Menstruation, Mood Swings) That Affect My Academic Work.": "Symptoms Affect Work",
+    "I Feel Anxious About How Health-Related Issues May Affect My Studies.": "Anxious Health Studies",
+    "I Sometimes Miss Deadlines Or Classes Due To Health Struggles.": "Miss Deadlines Health",
+    "I Feel Unsupported In Balancing My Health And Academic Responsibilities.": "Unsupported Balance",
+}
+
+# Likert item fields on StudentProfile -> short column names, grouped by composite score
+SCORE_ITEMS = {
+    "pcos_awareness_score": {
+        "awareness_1": "Familiar PCOS",
+        "awareness_2": "Know Symptoms Irregular",
+        "awareness_3": "Know Symptoms Acne",
+        "awareness_4": "Understand Health Impact",
+        "awareness_5": "Aware Treatments",
+    },
+    "academic_pressure_score": {
+        "academic_1": "Academic Pressure",
+        "academic_2": "Stress Affects Health",
+        "academic_3": "Fatigue Affects Concentration",
+    },
+    "pcos_symptoms_score": {
+        "symptoms_1": "Performance Influenced Health",
+        "symptoms_2": "Symptoms Affect Work",
+        "symptoms_3": "Anxious Health Studies",
+        "symptoms_4": "Miss Deadlines Health",
+        "symptoms_5": "Unsupported Balance",
+    },
+}
+
+# SQLite caps bound parameters per statement; stay well under it
+INSERT_BATCH_SIZE = 500
+
+
+def coerce_int(series):
+    """
+    Convert a column to nullable integers, truncating decimals.
+
+    Blank cells, "No response" and anything non-numeric become missing.
+
+    Args:
+        series (pd.Series): Raw column
+
+    Returns:
+        pd.Series: Int64 column
+    """
+    if series.dtype == object:
+        series = series.astype(str).str.strip()
+    values = pd.to_numeric(series, errors="coerce").astype(float)
+    values[~np.isfinite(values)] = np.nan
+    return np.trunc(values).astype("Int64")
+
+
+def coerce_text(series):
+    """Convert a column to stripped strings, keeping missing values as None."""
+    return series.astype(str).str.strip().where(series.notna(), None)
+
+
+def normalize_cells(series):
+    """
+    Render a column as canonical text for fingerprinting.
+
+    Whole-number floats lose their ".0" so a column that picked up a blank
+    (and therefore a float dtype) hashes the same as one that did not.
+
+    Args:
+        series (pd.Series): Raw column
+
+    Returns:
+        pd.Series: Stripped strings, "" for missing cells
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        whole = np.isfinite(values) & (values == np.trunc(values))
+        # Integer formatting is much cheaper than float formatting; only the
+        # rare fractional cells go through repr
+        text = np.where(whole, values, 0).astype("int64").astype(str).astype(object)
+        text[~whole] = [repr(value) for value in values[~whole].tolist()]
+        text[np.isnan(values)] = ""
+        return pd.Series(text, index=series.index)
+    return series.astype(str).str.strip().where(series.notna(), "")
+
+
+def row_fingerprints(df):
+    """
+    Hash every uploaded row's content into a stable fingerprint.
+
+    The hash covers the column names and all cell values, ignoring column
+    order and row position, so the same survey export always produces the
+    same fingerprints.
+
+    Args:
+        df (pd.DataFrame): Upload with headers already renamed via COLUMN_MAPPING
+
+    Returns:
+        pd.Series: SHA-256 hex digests aligned with df.index
+    """
+    columns = sorted(df.columns)
+    header = "\x1f".join(columns) + "\x1e"
+    cells = [normalize_cells(df[column]) for column in columns]
+    rows = cells[0].str.cat(cells[1:], sep="\x1f") if len(cells) > 1 else cells[0]
+    return pd.Series([hashlib.sha256((header + row).encode("utf-8")).hexdigest() for row in rows],
+                     index=df.index)
+
+
+def existing_fingerprints(fingerprints):
+    """Return the subset of fingerprints already stored on imported profiles."""
+    fingerprints = list(fingerprints)
+    existing = set()
+    for start in range(0, len(fingerprints), INSERT_BATCH_SIZE):
+        chunk = fingerprints[start:start + INSERT_BATCH_SIZE]
+        existing.update(fingerprint for (fingerprint,) in db.session.query(StudentProfile.import_fingerprint)
+                        .filter(StudentProfile.import_fingerprint.in_(chunk)))
+    return existing
+
+
+def build_profile_frame(df):
+    """
+    Map an uploaded survey sheet to StudentProfile columns.
+
+    Every step is column-wise: one coercion per column and one row-wise
+    mean per composite score.
+
+    Args:
+        df (pd.DataFrame): Upload with headers already renamed via COLUMN_MAPPING
+
+    Returns:
+        tuple: (profiles DataFrame for importable rows, skipped count, error list)
+    """
+    errors = []
+
+    # Rows with no age are skipped; non-numeric ages are reported as errors
+    raw_age = df["Age"]
+    age = coerce_int(raw_age)
+    invalid = raw_age.notna() & age.isna()
+    for index, value in raw_age[invalid].items():
+        errors.append(f"Row {index + 1}: invalid Age value {value!r}")
+    keep = age.notna()
+    skipped = int((~keep).sum())
+
+    fingerprints = row_fingerprints(df)[keep]
+    df = df[keep]
+    profiles = pd.DataFrame(index=df.index)
+    profiles["import_fingerprint"] = fingerprints
+    profiles["name"] = [f"Imported Student {index + 1}" for index in df.index]
+    profiles["age"] = age[keep]
+
+    year_level = coerce_text(df["Year Level"])
+    profiles["degree_program"] = ("Year " + year_level).where(year_level.notna() & (year_level != ""), None)
+    profiles["consent"] = True
+
+    if "Clinical Diagnosis" in df.columns:
+        profiles["clinical_diagnosis"] = coerce_text(df["Clinical Diagnosis"])
+    else:
+        profiles["clinical_diagnosis"] = None
+
+    # Likert items and their composite means
+    for score, items in SCORE_ITEMS.items():
+        for field, column in items.items():
+            if column in df.columns:
+                profiles[field] = coerce_int(df[column])
+            else:
+                profiles[field] = pd.Series(pd.NA, index=df.index, dtype="Int64")
+        profiles[score] = profiles[list(items)].astype(float).mean(axis=1)
+
+    return profiles, skipped, errors
+
+
+def _records(frame):
+    """DataFrame rows as dicts with pandas missing values turned into None."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def import_dataframe(df, password_hash=None):
+    """
+    Create imported users and student profiles from an uploaded sheet.
+
+    Users and profiles are written with one bulk INSERT per batch and the
+    placeholder password is hashed once per import. Rows whose content
+    fingerprint is already stored (or repeats earlier in the same sheet)
+    are counted as duplicates and not inserted again. The caller commits.
+
+    Args:
+        df (pd.DataFrame): Upload with headers already renamed via COLUMN_MAPPING
+        password_hash (str, optional): Precomputed hash of IMPORT_PASSWORD
+
+    Returns:
+        dict: created, duplicates, skipped and errors for the upload
+    """
+    profiles, skipped, errors = build_profile_frame(df)
+
+    # Set difference against fingerprints already in the database
+    seen = existing_fingerprints(profiles["import_fingerprint"].unique())
+    new_rows = ~(profiles["import_fingerprint"].isin(seen) | profiles["import_fingerprint"].duplicated())
+    duplicates = int((~new_rows).sum())
+    profiles = profiles[new_rows]
+
+    if profiles.empty:
+        return {"created": 0, "duplicates": duplicates, "skipped": skipped, "errors": errors}
+
+    if password_hash is None:
+        password_hash = generate_password_hash(IMPORT_PASSWORD)
+
+    # Unique email per imported row
+    timestamp = pd.Timestamp.now().timestamp()
+    emails = [f"import_{index}_{timestamp}@pcos.research" for index in profiles.index]
+
+    existing = set()
+    for start in range(0, len(emails), INSERT_BATCH_SIZE):
+        chunk = emails[start:start + INSERT_BATCH_SIZE]
+        existing.update(email for (email,) in db.session.query(User.email).filter(User.email.in_(chunk)))
+    if existing:
+        new_rows = [email not in existing for email in emails]
+        skipped += len(emails) - sum(new_rows)
+        profiles = profiles[new_rows]
+        emails = [email for email in emails if email not in existing]
+
+    created_at = datetime.utcnow()
+    profile_rows = _records(profiles)
+
+    for start in range(0, len(emails), INSERT_BATCH_SIZE):
+        user_ids = db.session.scalars(
+            insert(User.__table__).returning(User.__table__.c.id, sort_by_parameter_order=True),
+            [{"email": email, "password_hash": password_hash, "is_admin": False, "created_at": created_at}
+             for email in emails[start:start + INSERT_BATCH_SIZE]]
+        ).all()
+
+        batch = profile_rows[start:start + INSERT_BATCH_SIZE]
+        for row, user_id in zip(batch, user_ids):
+            row["user_id"] = user_id
+        db.session.execute(insert(StudentProfile.__table__), batch)
+
+    return {"created": len(emails), "duplicates": duplicates, "skipped": skipped, "errors": errors}
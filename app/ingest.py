@@ -0,0 +1,217 @@
+"""
+Ingestion Module for PCOS Monitor System
+Validates and stores batches of survey and academic submissions.
+
+Collectors that buffer submissions offline send them as one JSON array.
+Each check runs column-wise over the whole batch; valid items are then
+written with one bulk INSERT per table, and the running aggregates and
+survey rollups are updated in the same transaction, so a batch of
+thousands costs a single commit. Invalid items are reported back by
+position and do not stop the rest of the batch.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, select
+
+from .extensions import db
+from .models import StudentProfile, AcademicRecord, SurveyResponse
+
+# Largest number of items accepted in one request
+MAX_INGEST_ITEMS = 5000
+
+# Item "type" -> model stored
+INGEST_MODELS = {"survey": SurveyResponse, "academic": AcademicRecord}
+
+# Survey ratings share the 1-5 scale of the submission form, and are required like there
+SURVEY_SCALES = ["fatigue", "mood_swings", "sleep_quality", "perceived_academic_stress"]
+LIKERT_RANGE = (1, 5)
+
+# Yes/no survey answers; missing means no, as with an unticked form checkbox
+SURVEY_FLAGS = ["irregular_menstruation", "acne"]
+
+# Academic metrics -> (minimum, maximum); missing values are stored as 0.0 like the form
+ACADEMIC_BOUNDS = {"gpa": (0, 5), "attendance_percent": (0, 100), "study_hours_per_week": (0, None)}
+
+# Integer ids must stay inside SQLite's signed 64-bit range to be looked up
+MAX_ID_MAGNITUDE = 2 ** 63
+
+# Fields an item may carry besides its metrics
+ITEM_FIELDS = {
+    "survey": ["type", "profile_id", "date", "notes", *SURVEY_SCALES, *SURVEY_FLAGS],
+    "academic": ["type", "profile_id", "created_at", "term", *ACADEMIC_BOUNDS],
+}
+
+
+def _column(frame, name):
+    """A payload column, all missing when no item has the field."""
+    return frame[name] if name in frame.columns else pd.Series(None, index=frame.index, dtype=object)
+
+
+def _numbers(raw):
+    """Numeric payload values; JSON booleans and non-numbers become NaN."""
+    return pd.to_numeric(raw.where(~raw.map(lambda value: isinstance(value, bool)), None), errors="coerce")
+
+
+def _timestamps(raw):
+    """Parse ISO 8601 strings to naive UTC datetimes; unparseable values become NaT."""
+    text = raw.where(raw.map(lambda value: isinstance(value, str)), None)
+    parsed = pd.to_datetime(text, errors="coerce", utc=True, format="ISO8601")
+    return parsed.dt.tz_convert(None)
+
+
+def validate_items(items, user):
+    """
+    Check a batch of submissions, one vectorized pass per field.
+
+    Non-admin users submit for their own profile, so their items may leave
+    profile_id out; admins must name an existing profile on every item.
+
+    Args:
+        items (list): Decoded JSON items
+        user (User): Submitting user
+
+    Returns:
+        tuple: (DataFrame of the items with parsed values, dict of item
+            index -> list of error messages for invalid items)
+    """
+    errors = defaultdict(list)
+
+    def fail(mask, message):
+        for index in np.flatnonzero(mask.to_numpy(dtype=bool)):
+            errors[int(index)].append(message)
+
+    objects = [isinstance(item, dict) for item in items]
+    frame = pd.DataFrame([item if ok else {} for item, ok in zip(items, objects)],
+                         index=range(len(items)), dtype=object)
+    fail(~pd.Series(objects), "Item must be a JSON object")
+
+    kind = _column(frame, "type")
+    fail(pd.Series(objects) & ~kind.isin(list(INGEST_MODELS)),
+         f"type must be one of: {', '.join(INGEST_MODELS)}")
+    surveys, academics = kind == "survey", kind == "academic"
+
+    # Fields that belong to neither item type, or to the other one
+    for name in frame.columns:
+        present = frame[name].notna()
+        for item_type, mask in (("survey", surveys), ("academic", academics)):
+            if name not in ITEM_FIELDS[item_type]:
+                fail(present & mask, f"Unknown field for {item_type} items: {name}")
+
+    # Profiles
+    raw_profile = _column(frame, "profile_id")
+    profile_id = _numbers(raw_profile)
+    fail(raw_profile.notna() & (profile_id.isna() | (profile_id % 1 != 0)), "profile_id must be an integer")
+    if user.is_admin:
+        fail(raw_profile.isna(), "profile_id is required")
+        in_range = profile_id.abs() < MAX_ID_MAGNITUDE
+        wanted = [int(value) for value in profile_id[in_range].dropna().unique() if value % 1 == 0]
+        known = set(db.session.scalars(select(StudentProfile.id).where(StudentProfile.id.in_(wanted))))
+        fail(profile_id.notna() & ~profile_id.isin(list(known)), "Unknown profile_id")
+    else:
+        own = user.profile.id if user.profile is not None else None
+        if own is None:
+            fail(pd.Series(True, index=frame.index), "Complete your profile before submitting data")
+        else:
+            fail(profile_id.notna() & (profile_id != own), "You can only submit data for your own profile")
+            profile_id = profile_id.fillna(own)
+    frame["profile_id"] = profile_id
+
+    # Surveys
+    for name in SURVEY_SCALES:
+        raw = _column(frame, name)
+        value = _numbers(raw)
+        fail(surveys & raw.isna(), f"{name} is required")
+        fail(surveys & raw.notna() & ~(value.between(*LIKERT_RANGE) & (value % 1 == 0)),
+             f"{name} must be a whole number from {LIKERT_RANGE[0]} to {LIKERT_RANGE[1]}")
+        frame[name] = value
+    for name in SURVEY_FLAGS:
+        raw = _column(frame, name)
+        fail(surveys & raw.notna() & ~raw.map(lambda value: isinstance(value, bool)), f"{name} must be true or false")
+        frame[name] = raw.where(raw.notna(), False)
+    notes = frame["notes"] = _column(frame, "notes")
+    fail(surveys & notes.notna() & ~notes.map(lambda value: isinstance(value, str)), "notes must be a string")
+
+    # Academic records
+    term = frame["term"] = _column(frame, "term")
+    fail(academics & ~term.map(lambda value: isinstance(value, str) and bool(value.strip())),
+         "term is required")
+    for name, (low, high) in ACADEMIC_BOUNDS.items():
+        raw = _column(frame, name)
+        value = _numbers(raw)
+        in_range = (value >= low) & (value <= high if high is not None else True)
+        bound = f"from {low} to {high}" if high is not None else f"of at least {low}"
+        fail(academics & raw.notna() & ~in_range, f"{name} must be a number {bound}")
+        frame[name] = value.fillna(0.0)
+
+    # Timestamps default to the time of ingestion, like the form's column defaults
+    now = datetime.utcnow()
+    for name, mask in (("date", surveys), ("created_at", academics)):
+        raw = _column(frame, name)
+        moment = _timestamps(raw)
+        fail(mask & raw.notna() & moment.isna(), f"{name} must be an ISO 8601 date or datetime")
+        frame[name] = moment.astype(object).where(moment.notna(), now)
+
+    return frame, errors
+
+
+def _rows(frame, columns):
+    """Plain-Python dicts for bulk insert, with missing values as None."""
+    rows = frame[columns].astype(object).where(frame[columns].notna(), None).to_dict(orient="records")
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, pd.Timestamp):
+                row[key] = value.to_pydatetime()
+            elif isinstance(value, np.generic):
+                row[key] = value.item()
+    return rows
+
+
+def ingest_items(items, user):
+    """
+    Validate a batch and store its valid items in one transaction.
+
+    Args:
+        items (list): Decoded JSON items, each with "type" set to "survey"
+            or "academic" and the model's column names as fields
+        user (User): Submitting user
+
+    Returns:
+        dict: created and failed counts, and one result per item in input
+            order: {"index", "status": "created", "type", "id"} or
+            {"index", "status": "invalid", "errors"}
+    """
+    from . import aggregates, rollups
+
+    frame, errors = validate_items(items, user)
+    valid = ~frame.index.isin(list(errors))
+    results = [{"index": index, "status": "invalid", "errors": errors[index]} if index in errors else None
+               for index in range(len(items))]
+
+    stored = {}
+    for item_type, model in INGEST_MODELS.items():
+        batch = frame[valid & (_column(frame, "type") == item_type)].copy()
+        if batch.empty:
+            continue
+        for name in ["profile_id", *(SURVEY_SCALES if item_type == "survey" else [])]:
+            batch[name] = batch[name].astype(int)
+        columns = [name for name in ITEM_FIELDS[item_type] if name != "type"]
+        rows = _rows(batch, columns)
+        ids = db.session.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+        for index, row, new_id in zip(batch.index, rows, ids):
+            results[index] = {"index": int(index), "status": "created", "type": item_type, "id": new_id}
+        stored[item_type] = rows
+
+    if stored:
+        if "academic" in stored:
+            aggregates.record_academic(stored["academic"])
+        if "survey" in stored:
+            aggregates.record_surveys(stored["survey"])
+            rollups.record_surveys(stored["survey"])
+        db.session.commit()
+
+    created = sum(len(rows) for rows in stored.values())
+    return {"created": created, "failed": len(items) - created, "results": results}
@@ -0,0 +1,306 @@
+"""
+Background Jobs for PCOS Monitor System
+Runs large CSV and Excel imports on a thread pool and records progress in the import_jobs table.
+
+Uploads are parsed in fixed-size chunks straight from the saved file and
+each chunk is committed in its own transaction, so memory stays flat no
+matter how large the upload is.
+
+Progress lives in the database, so any worker can answer a status poll
+and a job survives the uploader refreshing the page. Cancellation is
+cooperative: the runner checks the job's cancel flag between chunks.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from datetime import datetime
+
+import pandas as pd
+from werkzeug.security import generate_password_hash
+
+from .cohort import cohort_statistics
+from .extensions import db, report_cache
+from .importer import COLUMN_MAPPING, REQUIRED_COLUMNS, IMPORT_PASSWORD, import_dataframe
+from .models import ImportJob
+
+# Rows imported (and committed) per progress update
+IMPORT_CHUNK_SIZE = 5000
+
+# Errors and per-chunk results kept on the job row
+MAX_JOB_ERRORS = 50
+MAX_JOB_CHUNKS = 200
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Cell text read_csv treats as missing by default; applied to Excel cells
+# so both formats map (and fingerprint) the same sheet identically
+NA_STRINGS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+_executor = None
+
+
+def _get_executor(app):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app.config.get("IMPORT_JOB_WORKERS", 2),
+            thread_name_prefix="import-job"
+        )
+    return _executor
+
+
+def upload_dir(app):
+    """Directory where uploads wait for their job to pick them up."""
+    path = app.config.get("IMPORT_UPLOAD_DIR") or os.path.join(app.instance_path, "uploads")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def submit_import(app, job_id, path):
+    """
+    Queue an import job for background execution.
+
+    Args:
+        app (Flask): Application, used to open an app context in the worker thread
+        job_id (int): ImportJob id
+        path (str): Saved upload to import; deleted when the job finishes
+    """
+    return _get_executor(app).submit(_run_import, app, job_id, path)
+
+
+def request_cancel(job):
+    """Flag a job for cancellation; the runner stops after its current chunk."""
+    if job.status in ACTIVE_STATUSES:
+        job.cancel_requested = True
+        if job.status == "queued":
+            _finish(job, "cancelled", "Import cancelled before it started.")
+        db.session.commit()
+
+
+def job_status(job):
+    """
+    Serialize an import job for the polling endpoint.
+
+    Returns:
+        dict: Progress counters, errors and an ETA in seconds when running
+    """
+    eta = None
+    if job.status == "running" and job.started_at and job.total_rows and job.processed_rows:
+        elapsed = (datetime.utcnow() - job.started_at).total_seconds()
+        rate = job.processed_rows / elapsed if elapsed > 0 else None
+        if rate:
+            eta = round((job.total_rows - job.processed_rows) / rate, 1)
+
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "cancel_requested": bool(job.cancel_requested),
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows or 0,
+        "created": job.created_rows or 0,
+        "duplicates": job.duplicate_rows or 0,
+        "skipped": job.skipped_rows or 0,
+        "errors": json.loads(job.errors) if job.errors else [],
+        "chunks": json.loads(job.chunk_results) if job.chunk_results else [],
+        "message": job.message,
+        "eta_seconds": eta,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _finish(job, status, message):
+    job.status = status
+    job.message = message
+    job.finished_at = datetime.utcnow()
+
+
+def read_csv_chunks(path, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Parse a CSV upload incrementally.
+
+    Only one chunk is held in memory at a time. Year Level is read as text
+    so chunks with and without blanks format it the same way.
+
+    Args:
+        path (str): CSV file
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        tuple: (DataFrame chunk, fraction of the file read so far)
+    """
+    total_bytes = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunk_size, dtype={"Year Level": str}):
+            yield chunk, (handle.tell() / total_bytes if total_bytes else None)
+
+
+def read_xlsx_chunks(path, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Parse the first sheet of an Excel upload incrementally.
+
+    The workbook is opened in openpyxl's read-only mode, which streams the
+    sheet XML row by row instead of loading the whole sheet.
+
+    Args:
+        path (str): .xlsx file
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        tuple: (DataFrame chunk, fraction of the sheet read so far)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = [str(name).strip() if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        width = len(columns)
+        # max_row comes from the sheet's dimension tag and may be missing
+        total = sheet.max_row - 1 if sheet.max_row else None
+
+        read = 0
+        while True:
+            batch = [tuple(row[:width]) + (None,) * (width - len(row)) for row in islice(rows, chunk_size)]
+            if not batch:
+                return
+            chunk = pd.DataFrame.from_records(batch, columns=columns, index=range(read, read + len(batch)))
+            read += len(batch)
+            # Missing markers and blank rows are handled as read_csv does
+            chunk = chunk.mask(chunk.isin(NA_STRINGS)).dropna(how="all")
+            if len(chunk):
+                yield chunk, (read / total if total else None)
+    finally:
+        workbook.close()
+
+
+# Chunk readers by upload file extension
+CHUNK_READERS = {
+    ".csv": read_csv_chunks,
+    ".xlsx": read_xlsx_chunks,
+}
+
+IMPORT_EXTENSIONS = tuple(CHUNK_READERS)
+
+
+def read_chunks(path, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Parse an upload incrementally with the reader for its file extension.
+
+    Args:
+        path (str): Saved upload
+        chunk_size (int): Rows per chunk
+
+    Yields:
+        tuple: (DataFrame chunk with headers renamed via COLUMN_MAPPING,
+                fraction of the file read so far or None)
+    """
+    reader = CHUNK_READERS[os.path.splitext(path)[1].lower()]
+    for chunk, fraction in reader(path, chunk_size):
+        yield chunk.rename(columns=COLUMN_MAPPING), fraction
+
+
+def import_file(job, path):
+    """
+    Import a saved upload into the database, one transaction per chunk.
+
+    Progress counters and per-chunk results are committed on the job row
+    after every chunk. The total row count is estimated from how much of
+    the file has been read until the last chunk makes it exact.
+
+    Args:
+        job (ImportJob): Job to update; must be in the "running" state
+        path (str): CSV or .xlsx file to import
+    """
+    password_hash = generate_password_hash(IMPORT_PASSWORD)
+    errors = []
+    chunk_results = []
+
+    for number, (chunk, fraction) in enumerate(read_chunks(path, IMPORT_CHUNK_SIZE), 1):
+        if number == 1:
+            missing_cols = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing_cols:
+                _finish(job, "failed", f"Missing required columns: {', '.join(missing_cols)}. "
+                                       "Please download the sample CSV for reference.")
+                db.session.commit()
+                return
+
+        db.session.refresh(job)
+        if job.cancel_requested:
+            _finish(job, "cancelled", f"Import cancelled after {job.processed_rows} rows.")
+            db.session.commit()
+            return
+
+        result = import_dataframe(chunk, password_hash=password_hash)
+
+        errors.extend(result["errors"])
+        chunk_results.append({
+            "chunk": number,
+            "first_row": int(chunk.index[0]) + 1,
+            "rows": len(chunk),
+            "created": result["created"],
+            "duplicates": result["duplicates"],
+            "skipped": result["skipped"],
+            "errors": len(result["errors"]),
+        })
+
+        job.processed_rows += len(chunk)
+        job.created_rows += result["created"]
+        job.duplicate_rows += result["duplicates"]
+        job.skipped_rows += result["skipped"]
+        job.errors = json.dumps(errors[:MAX_JOB_ERRORS])
+        job.chunk_results = json.dumps(chunk_results[-MAX_JOB_CHUNKS:])
+
+        if fraction and fraction < 1:
+            job.total_rows = max(job.processed_rows, round(job.processed_rows / fraction))
+
+        # Each chunk is its own transaction
+        db.session.commit()
+        report_cache.bump_version()
+        if result["created"]:
+            cohort_statistics().invalidate()
+
+    job.total_rows = job.processed_rows
+    message = "Successfully imported file."
+    if errors:
+        message += " Some rows had errors and were skipped."
+    _finish(job, "completed", message)
+    db.session.commit()
+
+
+def _run_import(app, job_id, path):
+    """Worker entry point: import the saved upload chunk by chunk."""
+    with app.app_context():
+        job = db.session.get(ImportJob, job_id)
+        try:
+            if job is None or job.status != "queued":
+                return
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+
+            import_file(job, path)
+
+        except Exception as e:
+            db.session.rollback()
+            if job is not None:
+                job = db.session.get(ImportJob, job_id)
+                _finish(job, "failed", f"Failed to process upload: {str(e)}")
+                db.session.commit()
+            app.logger.exception(e)
+
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,86 @@
+"""
+Lazy Dashboard Module for PCOS Monitor System
+Mounts the Dash dashboard on the first request under /dashboard/.
+
+Dash, plotly and pandas take most of a worker's startup time and memory,
+while most requests never touch the dashboard. create_app therefore only
+wraps the WSGI app with LazyDashboard; the dashboard itself
+(app/dash_app.py) is imported and built the first time a worker sees a
+/dashboard/ request.
+
+Dash runs on its own Flask server, so the main app's before-request
+hooks (such as the baseline redirect in app/main.py) would not run for
+the dashboard; LazyDashboard runs them itself before forwarding, and adds
+the main app's session cookie to the dashboard's response when a hook
+changed the session.
+"""
+
+import threading
+
+from flask import session
+
+# Requests under this path prefix are served by the Dash app
+DASHBOARD_PREFIX = "/dashboard/"
+
+
+class LazyDashboard:
+    """
+    WSGI middleware that builds the dashboard on first use.
+
+    Args:
+        app (Flask): The main application; its original wsgi_app serves
+            every request outside DASHBOARD_PREFIX
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.dashboard = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Import and build the Dash app once per worker; returns its WSGI server."""
+        if self.dashboard is None:
+            with self._lock:
+                if self.dashboard is None:
+                    from .dash_app import create_dashboard
+                    self.dashboard = create_dashboard(self.app).server
+        return self.dashboard
+
+    def __call__(self, environ, start_response):
+        if not environ.get("PATH_INFO", "").startswith(DASHBOARD_PREFIX):
+            return self.wsgi_app(environ, start_response)
+
+        # The main app's request checks come first; a response from one
+        # (e.g. a redirect to profile setup) is sent instead of the dashboard
+        with self.app.request_context(environ):
+            response = self.app.preprocess_request()
+            if response is not None:
+                response = self.app.process_response(self.app.make_response(response))
+                return response(environ, start_response)
+            cookies = self.session_cookies()
+        if not cookies:
+            return self.load()(environ, start_response)
+
+        def start_with_cookies(status, headers, exc_info=None):
+            return start_response(status, headers + cookies, exc_info)
+
+        return self.load()(environ, start_with_cookies)
+
+    def session_cookies(self):
+        """
+        Set-Cookie headers that save the main app's session, if the request checks changed it.
+
+        Dash never saves the main app's session, so without these a value
+        the checks store (such as the baseline marker) would be lost and
+        the checks would redo their work on every dashboard request.
+        """
+        response = self.app.response_class()
+        self.app.session_interface.save_session(self.app, session._get_current_object(), response)
+        return [(name, value) for name, value in response.headers if name == "Set-Cookie"]
+
+
+def init_dashboard(app):
+    """Serve the dashboard under DASHBOARD_PREFIX, building it on the first request there."""
+    app.wsgi_app = LazyDashboard(app)
+    app.extensions["dashboard"] = app.wsgi_app
@@ -1,19 +1,27 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session, current_app
 from flask_login import login_required, current_user
-from .extensions import db
+from .extensions import db, report_cache
 from .models import StudentProfile, AcademicRecord, SurveyResponse
+from .identity import BASELINE_SESSION_KEY
 
 main_bp = Blueprint("main", __name__, template_folder="templates")
 
 
 ############# FORCE BASELINE COMPLETION CHECK #############
 def require_baseline():
-    if request.endpoint in ["main.index", "main.profile_setup"]:
+    if request.endpoint in ["main.index", "main.profile_setup", "static"]:
+        return
+    # The signed session cookie remembers a completed baseline, so most
+    # requests skip loading the user and profile here
+    user_id = session.get("_user_id")
+    if user_id is not None and session.get(BASELINE_SESSION_KEY) == user_id:
         return
     if current_user.is_authenticated:
         profile = current_user.profile
         if profile and profile.awareness_1 is None:
             return redirect(url_for("main.profile_setup"))
+        if profile:
+            session[BASELINE_SESSION_KEY] = session.get("_user_id")
 
 
 @main_bp.before_app_request
@@ -33,7 +41,12 @@ def profile_setup():
     profile = current_user.profile
 
     if request.method == "POST":
+        from .rollups import move_profile
+        from .cohort import cohort_statistics, profile_scores
+        previous_scores = profile_scores(profile)
+        previous_diagnosis = profile.clinical_diagnosis
         profile.clinical_diagnosis = request.form.get("clinical_diagnosis")
+        move_profile(profile.id, previous_diagnosis, profile.clinical_diagnosis)
 
         # Awareness
         profile.awareness_1 = int(request.form.get("awareness_1"))
@@ -58,8 +71,11 @@ def profile_setup():
         profile.pcos_awareness_score = (profile.awareness_1 + profile.awareness_2 + profile.awareness_3 + profile.awareness_4 + profile.awareness_5) / 5
         profile.academic_pressure_score = (profile.academic_1 + profile.academic_2 + profile.academic_3) / 3
         profile.pcos_symptoms_score = (profile.symptoms_1 + profile.symptoms_2 + profile.symptoms_3 + profile.symptoms_4 + profile.symptoms_5) / 5
+        scores = profile_scores(profile)
 
         db.session.commit()
+        report_cache.bump_version()
+        cohort_statistics().record_change(previous_scores, scores)
         flash("Baseline PCOS profile survey completed successfully.", "success")
         return redirect(url_for("main.index"))
 
@@ -73,9 +89,13 @@ def submit_data():
     # SAFETY AUTO-FIX: regenerate missing profile if data was deleted
     profile = current_user.profile
     if profile is None:
+        from .cohort import cohort_statistics, profile_scores
         profile = StudentProfile(user_id=current_user.id)
         db.session.add(profile)
         db.session.commit()
+        report_cache.bump_version()
+        cohort_statistics().record_change(None, profile_scores(profile))
+        session.pop(BASELINE_SESSION_KEY, None)
 
     if request.method == "POST":
 
@@ -87,6 +107,7 @@ def submit_data():
         attendance = request.form.get("attendance", type=float)
         study_hours = request.form.get("study_hours", type=float)
 
+        ar = None
         if academic_year and semester and grading_period:
             term = f"{academic_year} - {semester} - {grading_period}"
             ar = AcademicRecord(profile_id=profile.id, term=term, gpa=gpa or 0.0,
@@ -107,7 +128,17 @@ def submit_data():
                             perceived_academic_stress=stress or 0, notes=notes)
         db.session.add(sr)
 
+        # Flush first so created_at/date defaults are set, then update the
+        # running aggregates and rollups in the same transaction as the new rows
+        from . import aggregates, rollups
+        db.session.flush()
+        if ar is not None:
+            aggregates.record_academic([ar])
+        aggregates.record_surveys([sr])
+        rollups.record_surveys([sr])
+
         db.session.commit()
+        report_cache.bump_version()
         flash("Data submitted successfully!", "success")
         return redirect(url_for("main.submit_data"))
 
@@ -124,10 +155,6 @@ def student_dashboard():
         flash("Personal dashboard is no longer available. Please use the Dashboard page.", "info")
         return redirect("/dashboard/")
 
-    from datetime import datetime
-    import pandas as pd
-    import numpy as np
-    
     # Get current student's profile
     profile = current_user.profile
     
@@ -159,12 +186,13 @@ def student_dashboard():
             "study_hours": record.study_hours_per_week
         })
     
-    # Academic averages
+    # Academic averages, read from the running per-profile aggregates
+    aggregate = profile.aggregate
     academic_stats = {
-        "avg_gpa": np.mean([r.gpa for r in academic_records if r.gpa]) if academic_records else None,
-        "avg_attendance": np.mean([r.attendance_percent for r in academic_records if r.attendance_percent]) if academic_records else None,
-        "avg_study_hours": np.mean([r.study_hours_per_week for r in academic_records if r.study_hours_per_week]) if academic_records else None,
-        "total_records": len(academic_records)
+        "avg_gpa": aggregate.mean("gpa") if aggregate else None,
+        "avg_attendance": aggregate.mean("attendance") if aggregate else None,
+        "avg_study_hours": aggregate.mean("study_hours") if aggregate else None,
+        "total_records": aggregate.academic_count if aggregate else 0
     }
     
     # --- Survey Responses Timeline ---
@@ -184,33 +212,17 @@ def student_dashboard():
     
     # Survey averages
     survey_stats = {
-        "avg_fatigue": np.mean([s.fatigue for s in survey_responses if s.fatigue]) if survey_responses else None,
-        "avg_mood": np.mean([s.mood_swings for s in survey_responses if s.mood_swings]) if survey_responses else None,
-        "avg_sleep": np.mean([s.sleep_quality for s in survey_responses if s.sleep_quality]) if survey_responses else None,
-        "avg_stress": np.mean([s.perceived_academic_stress for s in survey_responses if s.perceived_academic_stress]) if survey_responses else None,
-        "total_surveys": len(survey_responses)
+        "avg_fatigue": aggregate.mean("fatigue") if aggregate else None,
+        "avg_mood": aggregate.mean("mood") if aggregate else None,
+        "avg_sleep": aggregate.mean("sleep") if aggregate else None,
+        "avg_stress": aggregate.mean("stress") if aggregate else None,
+        "total_surveys": aggregate.survey_count if aggregate else 0
     }
     
     # --- Cohort Comparison (Anonymized Averages) ---
-    # Get all profiles except current user
-    all_profiles = StudentProfile.query.filter(StudentProfile.id != profile.id).all()
-    
-    cohort_stats = {
-        "cohort_size": len(all_profiles),
-        "avg_awareness": None,
-        "avg_academic_pressure": None,
-        "avg_symptoms": None
-    }
-    
-    if all_profiles:
-        cohort_stats["avg_awareness"] = np.mean([p.pcos_awareness_score for p in all_profiles if p.pcos_awareness_score])
-        cohort_stats["avg_academic_pressure"] = np.mean([p.academic_pressure_score for p in all_profiles if p.academic_pressure_score])
-        cohort_stats["avg_symptoms"] = np.mean([p.pcos_symptoms_score for p in all_profiles if p.pcos_symptoms_score])
-    
-    # Format cohort stats to 2 decimal places
-    for key in ["avg_awareness", "avg_academic_pressure", "avg_symptoms"]:
-        if cohort_stats[key] is not None:
-            cohort_stats[key] = round(cohort_stats[key], 2)
+    # Means and percentile ranks exclude the current student; see app/cohort.py
+    from .cohort import cohort_statistics
+    cohort_stats = cohort_statistics().summary(profile)
     
     # Format personal stats to 2 decimal places
     for key in ["avg_gpa", "avg_attendance", "avg_study_hours"]:
@@ -223,8 +235,8 @@ def student_dashboard():
     
     # --- Last Submission Date ---
     last_submission = None
-    if survey_responses:
-        last_submission = survey_responses[-1].date.strftime("%B %d, %Y")
+    if aggregate and aggregate.last_survey_at:
+        last_submission = aggregate.last_survey_at.strftime("%B %d, %Y")
     
     return render_template("student_dashboard.html",
                           personal_data=personal_data,
@@ -236,12 +248,80 @@ def student_dashboard():
                           last_submission=last_submission)
 
 
+@main_bp.route("/api/submissions", methods=["POST"])
+@login_required
+def bulk_submit():
+    """
+    Store a JSON array of survey and academic submissions in one transaction.
+
+    Items are validated together; valid ones are stored and invalid ones
+    are reported with their errors, one result per item in request order
+    (see app/ingest.py for the item format).
+    """
+    from .ingest import MAX_INGEST_ITEMS, ingest_items
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Request body must be a non-empty JSON array of submissions"}), 400
+    if len(items) > MAX_INGEST_ITEMS:
+        return jsonify({"error": f"At most {MAX_INGEST_ITEMS} submissions per request"}), 413
+
+    result = ingest_items(items, current_user)
+    if result["created"]:
+        report_cache.bump_version()
+    return jsonify(result)
+
+
 @main_bp.route("/api/profile/<int:profile_id>/data")
 @login_required
 def profile_data(profile_id):
-    profile = StudentProfile.query.get_or_404(profile_id)
-    academics = [{"term": a.term, "gpa": a.gpa, "attendance": a.attendance_percent, "study_hours": a.study_hours_per_week}
-                 for a in profile.academic_records]
-    surveys = [{"date": s.date.isoformat(), "fatigue": s.fatigue, "mood": s.mood_swings, "stress": s.perceived_academic_stress}
-               for s in profile.survey_responses]
-    return jsonify({"academics": academics, "surveys": surveys})
\ No newline at end of file
+    """
+    A profile's academic records and survey responses as paged JSON.
+
+    Query parameters: limit (rows per collection, default 100), cursor
+    (next_cursor of the previous page), fields (comma-separated output
+    fields; collections with none of them are omitted) and since (ISO
+    date; only records from then on). Responses carry an ETag and
+    Last-Modified, and conditional requests get 304 Not Modified until
+    the profile's records change.
+    """
+    from flask import abort
+    from werkzeug.http import is_resource_modified
+    from .profile_data import (MAX_PAGE_SIZE, PAGE_SIZE, decode_cursor, encode_cursor, fetch_page,
+                               parse_fields, parse_since, profile_validators)
+
+    if db.session.get(StudentProfile, profile_id) is None:
+        abort(404)
+
+    try:
+        limit = int(request.args.get("limit", PAGE_SIZE))
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        fields = parse_fields(request.args.get("fields"))
+        since = parse_since(request.args.get("since"))
+        positions = decode_cursor(request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag, last_modified = profile_validators(profile_id, request.args.to_dict())
+    if etag and not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        data, next_positions = {}, {}
+        for collection, names in fields.items():
+            if request.args.get("cursor") and collection not in positions:
+                data[collection] = []  # finished on an earlier page
+                continue
+            data[collection], last = fetch_page(profile_id, collection, names, after=positions.get(collection),
+                                                since=since, limit=limit)
+            if last is not None:
+                next_positions[collection] = last
+        data["next_cursor"] = encode_cursor(next_positions) if next_positions else None
+        response = jsonify(data)
+
+    if etag:
+        response.set_etag(etag)
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -21,13 +21,14 @@ class User(db.Model, UserMixin):
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    from .identity import load_identity
+    return load_identity(int(user_id))
 
 
 class StudentProfile(db.Model):
     __tablename__ = "student_profiles"
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     name = db.Column(db.String(120))
     age = db.Column(db.Integer)
     degree_program = db.Column(db.String(120))
@@ -36,8 +37,10 @@ class StudentProfile(db.Model):
     user = db.relationship("User", back_populates="profile")
     academic_records = db.relationship("AcademicRecord", back_populates="profile", cascade="all, delete-orphan")
     survey_responses = db.relationship("SurveyResponse", back_populates="profile", cascade="all, delete-orphan")
+    aggregate = db.relationship("ProfileAggregate", back_populates="profile", uselist=False, cascade="all, delete-orphan")
 
-    clinical_diagnosis = db.Column(db.String(50))
+    clinical_diagnosis = db.Column(db.String(50), index=True)
+    import_fingerprint = db.Column(db.String(64), unique=True, index=True)  # SHA-256 of the imported row
     pcos_awareness_score = db.Column(db.Float)
     pcos_symptoms_score = db.Column(db.Float)
     academic_pressure_score = db.Column(db.Float)
@@ -63,6 +66,9 @@ class StudentProfile(db.Model):
 
 class AcademicRecord(db.Model):
     __tablename__ = "academic_records"
+    __table_args__ = (
+        db.Index("ix_academic_records_profile_id_created_at", "profile_id", "created_at"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     profile_id = db.Column(db.Integer, db.ForeignKey("student_profiles.id"), nullable=False)
     term = db.Column(db.String(50))
@@ -76,9 +82,12 @@ class AcademicRecord(db.Model):
 
 class SurveyResponse(db.Model):
     __tablename__ = "survey_responses"
+    __table_args__ = (
+        db.Index("ix_survey_responses_profile_id_date", "profile_id", "date"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     profile_id = db.Column(db.Integer, db.ForeignKey("student_profiles.id"), nullable=False)
-    date = db.Column(db.DateTime, default=datetime.utcnow)
+    date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     fatigue = db.Column(db.Integer)
     irregular_menstruation = db.Column(db.Boolean)
     mood_swings = db.Column(db.Integer)
@@ -87,4 +96,91 @@ class SurveyResponse(db.Model):
     perceived_academic_stress = db.Column(db.Integer)
     notes = db.Column(db.Text)
 
-    profile = db.relationship("StudentProfile", back_populates="survey_responses")
\ No newline at end of file
+    profile = db.relationship("StudentProfile", back_populates="survey_responses")
+
+class ProfileAggregate(db.Model):
+    """Running per-profile sums and counts, maintained on every write (see app/aggregates.py)."""
+    __tablename__ = "profile_aggregates"
+    profile_id = db.Column(db.Integer, db.ForeignKey("student_profiles.id"), primary_key=True)
+
+    # Academic records; sums and counts skip missing and zero values
+    academic_count = db.Column(db.Integer, default=0, nullable=False)
+    gpa_sum = db.Column(db.Float, default=0.0, nullable=False)
+    gpa_count = db.Column(db.Integer, default=0, nullable=False)
+    attendance_sum = db.Column(db.Float, default=0.0, nullable=False)
+    attendance_count = db.Column(db.Integer, default=0, nullable=False)
+    study_hours_sum = db.Column(db.Float, default=0.0, nullable=False)
+    study_hours_count = db.Column(db.Integer, default=0, nullable=False)
+    last_academic_at = db.Column(db.DateTime)
+
+    # Survey responses
+    survey_count = db.Column(db.Integer, default=0, nullable=False)
+    fatigue_sum = db.Column(db.Float, default=0.0, nullable=False)
+    fatigue_count = db.Column(db.Integer, default=0, nullable=False)
+    mood_sum = db.Column(db.Float, default=0.0, nullable=False)
+    mood_count = db.Column(db.Integer, default=0, nullable=False)
+    sleep_sum = db.Column(db.Float, default=0.0, nullable=False)
+    sleep_count = db.Column(db.Integer, default=0, nullable=False)
+    stress_sum = db.Column(db.Float, default=0.0, nullable=False)
+    stress_count = db.Column(db.Integer, default=0, nullable=False)
+    last_survey_at = db.Column(db.DateTime)
+
+    # Time of the last write to the row, whatever the records' own dates
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    profile = db.relationship("StudentProfile", back_populates="aggregate")
+
+    def mean(self, metric):
+        """Mean of a metric's non-zero values, or None when there are none."""
+        count = getattr(self, f"{metric}_count")
+        return getattr(self, f"{metric}_sum") / count if count else None
+
+
+class SurveyRollup(db.Model):
+    """Survey metric totals per period and diagnosis group (see app/rollups.py)."""
+    __tablename__ = "survey_rollups"
+    __table_args__ = (
+        db.UniqueConstraint("granularity", "period_start", "diagnosis", name="uq_survey_rollups_key"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    granularity = db.Column(db.String(8), nullable=False)  # day, week or month
+    period_start = db.Column(db.Date, nullable=False)
+    diagnosis = db.Column(db.String(50), nullable=False)
+    response_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Per metric: count, sum and sum of squares of non-zero values
+    fatigue_count = db.Column(db.Integer, default=0, nullable=False)
+    fatigue_sum = db.Column(db.Float, default=0.0, nullable=False)
+    fatigue_sumsq = db.Column(db.Float, default=0.0, nullable=False)
+    mood_count = db.Column(db.Integer, default=0, nullable=False)
+    mood_sum = db.Column(db.Float, default=0.0, nullable=False)
+    mood_sumsq = db.Column(db.Float, default=0.0, nullable=False)
+    sleep_count = db.Column(db.Integer, default=0, nullable=False)
+    sleep_sum = db.Column(db.Float, default=0.0, nullable=False)
+    sleep_sumsq = db.Column(db.Float, default=0.0, nullable=False)
+    stress_count = db.Column(db.Integer, default=0, nullable=False)
+    stress_sum = db.Column(db.Float, default=0.0, nullable=False)
+    stress_sumsq = db.Column(db.Float, default=0.0, nullable=False)
+
+
+class ImportJob(db.Model):
+    __tablename__ = "import_jobs"
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    filename = db.Column(db.String(255))
+    status = db.Column(db.String(20), default="queued", index=True)  # queued, running, completed, failed, cancelled
+    cancel_requested = db.Column(db.Boolean, default=False)
+
+    total_rows = db.Column(db.Integer)
+    processed_rows = db.Column(db.Integer, default=0)
+    created_rows = db.Column(db.Integer, default=0)
+    duplicate_rows = db.Column(db.Integer, default=0)
+    skipped_rows = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Text)  # JSON list, capped
+    chunk_results = db.Column(db.Text)  # JSON list of per-chunk counters, capped
+    message = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
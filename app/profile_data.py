@@ -0,0 +1,179 @@
+"""
+Profile Data Module for PCOS Monitor System
+Paged, field-selectable reads behind /api/profile/<id>/data.
+
+Each collection is read with keyset pagination on (timestamp, id) for one
+profile, which is a range scan of the (profile_id, timestamp) indexes, so
+a page costs the same however many years of surveys precede it. Only the
+requested columns are selected.
+
+Responses are validated against the profile's profile_aggregates row:
+its updated_at changes with every record written for the profile, even
+one dated before the newest record, so it gives an ETag and
+Last-Modified without touching the records themselves.
+"""
+
+import base64
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select, tuple_
+
+from .extensions import db
+from .models import AcademicRecord, SurveyResponse, ProfileAggregate
+
+# Rows per collection in one page, unless ?limit= asks for fewer or more
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Collections in the response -> (timestamp the pages are ordered by, output field -> column)
+PROFILE_COLLECTIONS = {
+    "academics": (AcademicRecord.created_at, {
+        "term": AcademicRecord.term,
+        "gpa": AcademicRecord.gpa,
+        "attendance": AcademicRecord.attendance_percent,
+        "study_hours": AcademicRecord.study_hours_per_week,
+        "created_at": AcademicRecord.created_at,
+    }),
+    "surveys": (SurveyResponse.date, {
+        "date": SurveyResponse.date,
+        "fatigue": SurveyResponse.fatigue,
+        "mood": SurveyResponse.mood_swings,
+        "stress": SurveyResponse.perceived_academic_stress,
+    }),
+}
+
+
+def parse_fields(value):
+    """
+    Resolve a ?fields= list into the output fields wanted per collection.
+
+    Collections with none of the listed fields are left out of the
+    response (and not queried).
+
+    Args:
+        value (str): Comma-separated field names, or None/empty for all fields
+
+    Returns:
+        dict: Collection name -> list of field names
+
+    Raises:
+        ValueError: If a name is not a field of any collection
+    """
+    if not value:
+        return {name: list(columns) for name, (_, columns) in PROFILE_COLLECTIONS.items()}
+
+    wanted = [field.strip() for field in value.split(",") if field.strip()]
+    known = {field for _, columns in PROFILE_COLLECTIONS.values() for field in columns}
+    unknown = [field for field in wanted if field not in known]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(sorted(known))}")
+
+    selected = {}
+    for name, (_, columns) in PROFILE_COLLECTIONS.items():
+        fields = [field for field in columns if field in wanted]
+        if fields:
+            selected[name] = fields
+    return selected
+
+
+def parse_since(value):
+    """
+    Parse ?since= as an ISO 8601 date or datetime; None when absent.
+
+    Timestamps are stored as naive UTC, so a value with an offset is
+    converted to UTC and compared without it.
+    """
+    if not value:
+        return None
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("since must be an ISO 8601 date or datetime, e.g. 2024-03-01 or 2024-03-01T08:00:00")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def encode_cursor(positions):
+    """Opaque cursor token for the last (timestamp, id) returned per collection."""
+    data = {name: [moment.isoformat(), row_id] for name, (moment, row_id) in positions.items()}
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Positions stored in a cursor token.
+
+    Raises:
+        ValueError: If the token was not produced by encode_cursor
+    """
+    if not token:
+        return {}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return {name: (datetime.fromisoformat(moment), int(row_id))
+                for name, (moment, row_id) in data.items() if name in PROFILE_COLLECTIONS}
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+
+def fetch_page(profile_id, collection, fields, after=None, since=None, limit=PAGE_SIZE):
+    """
+    One page of a profile's records, oldest first.
+
+    Rows without a timestamp are skipped, since they cannot be paged.
+
+    Args:
+        profile_id (int): Profile to read
+        collection (str): Key of PROFILE_COLLECTIONS
+        fields (list): Output fields to select
+        after (tuple, optional): (timestamp, id) of the last row already returned
+        since (datetime, optional): Earliest timestamp included
+        limit (int): Rows per page
+
+    Returns:
+        tuple: (list of row dicts, (timestamp, id) of the last row when
+            more rows follow, else None)
+    """
+    timestamp, columns = PROFILE_COLLECTIONS[collection]
+    id_column = timestamp.class_.id
+    query = select(timestamp, id_column, *[columns[field] for field in fields]).where(
+        timestamp.class_.profile_id == profile_id, timestamp.isnot(None)
+    )
+    if since is not None:
+        query = query.where(timestamp >= since)
+    if after is not None:
+        query = query.where(tuple_(timestamp, id_column) > tuple_(*after))
+    rows = db.session.execute(query.order_by(timestamp, id_column).limit(limit + 1)).all()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    items = [{field: value.isoformat() if isinstance(value, datetime) else value
+              for field, value in zip(fields, row[2:])} for row in rows]
+    return items, (rows[-1][0], rows[-1][1]) if more else None
+
+
+def profile_validators(profile_id, request_args):
+    """
+    ETag and Last-Modified for a profile data response.
+
+    Args:
+        profile_id (int): Profile being read
+        request_args (dict): Query parameters, which are part of the ETag
+
+    Last-Modified has one-second resolution, so two writes within the
+    same second can share it; the ETag tells them apart.
+
+    Returns:
+        tuple: (etag string, last modified datetime or None); both are None
+            when the profile has no aggregates row yet
+    """
+    aggregate = db.session.get(ProfileAggregate, profile_id)
+    if aggregate is None:
+        return None, None
+
+    state = [aggregate.academic_count, aggregate.survey_count, aggregate.updated_at, sorted(request_args.items())]
+    etag = hashlib.sha256(json.dumps([profile_id, state], default=str).encode()).hexdigest()[:32]
+    return etag, aggregate.updated_at
@@ -0,0 +1,259 @@
+"""
+Query Layer for PCOS Monitor System
+SQL-side aggregates used by reports and admin analytics pages.
+
+Every function here returns small, already-aggregated results so callers
+never have to hydrate whole tables into ORM objects.
+
+numpy and pandas are imported inside the functions that need them, so
+the write paths that share this module's metric tables (aggregates,
+rollups) do not load them at startup.
+"""
+
+from sqlalchemy import func
+
+from .extensions import db
+from .models import StudentProfile, AcademicRecord, SurveyResponse, ProfileAggregate, SurveyRollup
+
+
+# Per-profile means pulled from the academic records table
+ACADEMIC_METRICS = {
+    "gpa": AcademicRecord.gpa,
+    "attendance": AcademicRecord.attendance_percent,
+    "study_hours": AcademicRecord.study_hours_per_week,
+}
+
+# Per-profile means pulled from the survey responses table
+SURVEY_METRICS = {
+    "fatigue": SurveyResponse.fatigue,
+    "mood": SurveyResponse.mood_swings,
+    "sleep": SurveyResponse.sleep_quality,
+    "stress": SurveyResponse.perceived_academic_stress,
+}
+
+
+def nonzero_avg(column):
+    """AVG that skips NULL and zero values, like the `if value` filters it replaces."""
+    return func.avg(func.nullif(column, 0))
+
+
+def diagnosis_label():
+    """Clinical diagnosis with blank values grouped under "Not Specified"."""
+    return func.coalesce(func.nullif(StudentProfile.clinical_diagnosis, ""), "Not Specified")
+
+
+def population_totals():
+    """
+    Get table counts and baseline score averages across all profiles.
+
+    Returns:
+        dict: Counts and unrounded averages
+    """
+    row = db.session.query(
+        func.count(StudentProfile.id),
+        nonzero_avg(StudentProfile.age),
+        nonzero_avg(StudentProfile.pcos_awareness_score),
+        nonzero_avg(StudentProfile.academic_pressure_score),
+        nonzero_avg(StudentProfile.pcos_symptoms_score),
+    ).one()
+
+    return {
+        "total_students": row[0],
+        "avg_age": row[1],
+        "avg_awareness": row[2],
+        "avg_pressure": row[3],
+        "avg_symptoms": row[4],
+        "total_academic_records": db.session.query(func.count(AcademicRecord.id)).scalar(),
+        "total_surveys": db.session.query(func.count(SurveyResponse.id)).scalar(),
+    }
+
+
+def diagnosis_groups():
+    """
+    Get profile counts and baseline score averages per diagnosis group.
+
+    Groups are returned in order of first appearance (lowest profile id).
+
+    Returns:
+        list: Row tuples of (diagnosis, count, avg_awareness, avg_pressure, avg_symptoms)
+    """
+    label = diagnosis_label()
+    return db.session.query(
+        label,
+        func.count(StudentProfile.id),
+        nonzero_avg(StudentProfile.pcos_awareness_score),
+        nonzero_avg(StudentProfile.academic_pressure_score),
+        nonzero_avg(StudentProfile.pcos_symptoms_score),
+    ).group_by(label).order_by(func.min(StudentProfile.id)).all()
+
+
+# Pandas period frequency per series resolution; weeks start on Monday
+SERIES_FREQUENCIES = {"day": "D", "week": "W-SUN", "month": "M"}
+
+
+def _histogram_quantiles(values, counts, probabilities):
+    """Quantiles (numpy's default linear method) of data given as sorted distinct values and counts."""
+    import numpy as np
+
+    cumulative = np.cumsum(counts)
+    positions = (cumulative[-1] - 1) * np.asarray(probabilities)
+    lower = np.floor(positions)
+    below = values[np.searchsorted(cumulative, lower, side="right")]
+    above = values[np.searchsorted(cumulative, np.minimum(lower + 1, cumulative[-1] - 1), side="right")]
+    return below + (above - below) * (positions - lower)
+
+
+def survey_date_range():
+    """First and last survey timestamps, or (None, None) without surveys."""
+    return db.session.query(func.min(SurveyResponse.date), func.max(SurveyResponse.date)).one()
+
+
+def survey_cursor():
+    """Highest survey id, used to fetch only newer rows later; 0 without surveys."""
+    return db.session.query(func.max(SurveyResponse.id)).scalar() or 0
+
+
+def survey_value_counts(column, resolution="day", start=None, end=None, after_id=None, up_to_id=None):
+    """
+    Count each distinct value of one survey metric per period.
+
+    The database returns one row per (day, distinct value); survey metrics
+    are small integers, so that is a few rows per day no matter how many
+    responses there are. Days are then merged into the requested periods.
+    Zero and missing values are skipped, like nonzero_avg.
+
+    Args:
+        column: SurveyResponse metric column
+        resolution (str): "day", "week" or "month"
+        start (datetime, optional): Earliest response included
+        end (datetime, optional): Latest response included
+        after_id (int, optional): Only responses with a higher id
+        up_to_id (int, optional): Only responses up to this id
+
+    Returns:
+        pd.DataFrame: period, value and count columns, sorted by period and value
+    """
+    import pandas as pd
+
+    day = func.date(SurveyResponse.date)
+    query = db.session.query(day, column, func.count()).filter(
+        SurveyResponse.date.isnot(None), func.coalesce(column, 0) != 0
+    )
+    if start is not None:
+        query = query.filter(SurveyResponse.date >= start)
+    if end is not None:
+        query = query.filter(SurveyResponse.date <= end)
+    if after_id is not None:
+        query = query.filter(SurveyResponse.id > after_id)
+    if up_to_id is not None:
+        query = query.filter(SurveyResponse.id <= up_to_id)
+
+    counts = pd.DataFrame(query.group_by(day, column).all(), columns=["day", "value", "count"])
+    periods = pd.to_datetime(counts["day"]).dt.to_period(SERIES_FREQUENCIES[resolution]).dt.start_time
+    return counts.groupby([periods.rename("period"), "value"])["count"].sum().reset_index()
+
+
+def series_statistics(counts):
+    """
+    Exact n, mean, median and quartiles per period from value counts.
+
+    Args:
+        counts (pd.DataFrame): survey_value_counts() output
+
+    Returns:
+        pd.DataFrame: Indexed by period start, with n, mean, median, q1, q3
+    """
+    import pandas as pd
+
+    statistics = ["n", "mean", "median", "q1", "q3"]
+    rows = {}
+    for period, group in counts.sort_values(["period", "value"]).groupby("period"):
+        values = group["value"].to_numpy(dtype=float)
+        weights = group["count"].to_numpy()
+        q1, median, q3 = _histogram_quantiles(values, weights, [0.25, 0.5, 0.75])
+        rows[period] = (weights.sum(), (values * weights).sum() / weights.sum(), median, q1, q3)
+
+    if not rows:
+        return pd.DataFrame(columns=statistics, index=pd.DatetimeIndex([], name="period"))
+    return pd.DataFrame.from_dict(rows, orient="index", columns=statistics).rename_axis("period")
+
+
+def survey_series(column, resolution="day", start=None, end=None):
+    """
+    Per-period count, mean, median and quartiles of one survey metric.
+
+    Args:
+        column: SurveyResponse metric column
+        resolution (str): "day", "week" or "month"
+        start (datetime, optional): Earliest response included
+        end (datetime, optional): Latest response included
+
+    Returns:
+        pd.DataFrame: Indexed by period start, with n, mean, median, q1, q3
+    """
+    return series_statistics(survey_value_counts(column, resolution, start, end))
+
+
+def rollup_mean(metric):
+    """Mean of a survey metric's non-zero values across the grouped survey_rollups rows."""
+    total = func.sum(getattr(SurveyRollup, f"{metric}_sum"))
+    count = func.sum(getattr(SurveyRollup, f"{metric}_count"))
+    return total / func.nullif(count, 0)
+
+
+def monthly_survey_averages():
+    """
+    Get survey metric averages bucketed by calendar month.
+
+    Reads the monthly survey_rollups rows (one per month and diagnosis
+    group) instead of scanning survey responses.
+
+    Returns:
+        list: Row tuples of (year, month, avg_fatigue, avg_mood, avg_stress, avg_sleep),
+              in chronological order
+    """
+    rows = db.session.query(
+        SurveyRollup.period_start,
+        rollup_mean("fatigue"),
+        rollup_mean("mood"),
+        rollup_mean("stress"),
+        rollup_mean("sleep"),
+    ).filter(SurveyRollup.granularity == "month").group_by(SurveyRollup.period_start).order_by(SurveyRollup.period_start)
+
+    return [(start.year, start.month, *means) for start, *means in rows]
+
+
+def aggregate_mean(metric):
+    """Mean of a metric from profile_aggregates' running sum and count; NULL when empty."""
+    total = getattr(ProfileAggregate, f"{metric}_sum")
+    count = getattr(ProfileAggregate, f"{metric}_count")
+    return total / func.nullif(count, 0)
+
+
+def profile_feature_frame():
+    """
+    Build the per-profile feature matrix in one query.
+
+    Academic and survey means come from the precomputed profile_aggregates
+    row (see app/aggregates.py), left-joined onto the composite baseline
+    scores, so no raw records are scanned. Blank diagnoses come back as
+    missing values so callers can choose their own label for them.
+
+    Returns:
+        pd.DataFrame: One row per profile, indexed by profile id
+    """
+    import pandas as pd
+
+    metrics = [*ACADEMIC_METRICS, *SURVEY_METRICS]
+    return pd.DataFrame(
+        db.session.query(
+            StudentProfile.id,
+            func.nullif(StudentProfile.clinical_diagnosis, ""),
+            StudentProfile.pcos_awareness_score,
+            StudentProfile.academic_pressure_score,
+            StudentProfile.pcos_symptoms_score,
+            *[aggregate_mean(metric) for metric in metrics]
+        ).outerjoin(ProfileAggregate, ProfileAggregate.profile_id == StudentProfile.id)
+        .order_by(StudentProfile.id).all(),
+        columns=["profile_id", "diagnosis", "awareness", "academic_pressure", "symptoms", *metrics]
+    ).set_index("profile_id").astype({name: float for name in ["awareness", "academic_pressure", "symptoms", *metrics]})
@@ -0,0 +1,211 @@
+"""
+Rollup Module for PCOS Monitor System
+Survey metric totals per period and diagnosis group, for time trends.
+
+Each survey_rollups row covers one (granularity, period start, diagnosis
+group) and holds the response count plus, per metric, the count, sum and
+sum of squares of non-zero values. Writers update the rows in the same
+transaction as the surveys they add, move or delete, so trend queries
+read a few hundred rollup rows instead of scanning survey_responses.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import bindparam, delete, update
+
+from .extensions import db
+from .models import StudentProfile, SurveyResponse, SurveyRollup
+from .queries import SURVEY_METRICS
+from .summary_tables import LOOKUP_BATCH_SIZE, ensure_rows, rebuild_command, rebuild_table
+
+# Period sizes kept in the rollup table
+GRANULARITIES = ("day", "week", "month")
+
+# Label for profiles without a clinical diagnosis, as queries.diagnosis_label()
+NOT_SPECIFIED = "Not Specified"
+
+# Survey rows per rebuild fetch
+REBUILD_BATCH_SIZE = 5000
+
+# Columns that identify a rollup row
+KEY_COLUMNS = ["granularity", "period_start", "diagnosis"]
+
+COUNTER_COLUMNS = ["response_count"] + [
+    f"{metric}_{part}" for metric in SURVEY_METRICS for part in ("count", "sum", "sumsq")
+]
+
+
+def period_start(moment, granularity):
+    """
+    First day of the period containing a timestamp.
+
+    Weeks start on Monday, as ISO weeks do.
+    """
+    day = moment.date()
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def diagnosis_labels(profile_ids):
+    """Rollup group label for each profile id."""
+    profile_ids = sorted(set(profile_ids))
+    labels = {}
+    for start in range(0, len(profile_ids), LOOKUP_BATCH_SIZE):
+        batch = profile_ids[start:start + LOOKUP_BATCH_SIZE]
+        rows = db.session.query(StudentProfile.id, StudentProfile.clinical_diagnosis).filter(StudentProfile.id.in_(batch))
+        labels.update((profile_id, diagnosis or NOT_SPECIFIED) for profile_id, diagnosis in rows)
+    return labels
+
+
+def _deltas(responses, labels=None, sign=1, deltas=None):
+    """
+    Per-rollup-row increments for a batch of survey responses.
+
+    Args:
+        responses (list): SurveyResponse instances or dicts with its column names
+        labels (dict, optional): profile_id -> diagnosis label; looked up when omitted
+        sign (int): 1 to add the responses, -1 to remove them
+        deltas (dict, optional): Increments to accumulate into
+
+    Returns:
+        dict: (granularity, period_start, diagnosis) -> {column: increment}
+    """
+    def getter(row):
+        return row.get if isinstance(row, dict) else (lambda key: getattr(row, key, None))
+
+    responses = [getter(row) for row in responses]
+    if labels is None:
+        labels = diagnosis_labels(get("profile_id") for get in responses)
+    deltas = {} if deltas is None else deltas
+
+    for get in responses:
+        moment = get("date")
+        if moment is None:
+            continue
+
+        # Zero and missing values are skipped, like queries.nonzero_avg
+        values = {metric: get(column.key) for metric, column in SURVEY_METRICS.items()}
+        label = labels.get(get("profile_id"), NOT_SPECIFIED)
+
+        for granularity in GRANULARITIES:
+            key = (granularity, period_start(moment, granularity), label)
+            delta = deltas.get(key)
+            if delta is None:
+                delta = deltas[key] = dict.fromkeys(COUNTER_COLUMNS, 0)
+            delta["response_count"] += sign
+            for metric, value in values.items():
+                if value:
+                    delta[f"{metric}_count"] += sign
+                    delta[f"{metric}_sum"] += sign * value
+                    delta[f"{metric}_sumsq"] += sign * value * value
+
+    return deltas
+
+
+def _apply(deltas):
+    """Add increments to the rollup rows with one executemany UPDATE."""
+    if not deltas:
+        return
+
+    table = SurveyRollup.__table__
+    ids = ensure_rows(table, KEY_COLUMNS, deltas)
+
+    statement = update(table).where(table.c.id == bindparam("b_id")).values(
+        {name: table.c[name] + bindparam(f"b_{name}") for name in COUNTER_COLUMNS}
+    )
+    db.session.execute(statement, [
+        {"b_id": ids[key], **{f"b_{name}": delta[name] for name in COUNTER_COLUMNS}}
+        for key, delta in deltas.items()
+    ])
+
+    # Periods whose last response was removed
+    db.session.execute(delete(table).where(table.c.id.in_([ids[key] for key in deltas]), table.c.response_count <= 0))
+
+
+def record_surveys(responses):
+    """
+    Add new survey responses to the rollups.
+
+    Call after the responses are flushed (so the date default is set) and
+    before the transaction commits.
+
+    Args:
+        responses (list): SurveyResponse instances or column dicts
+    """
+    _apply(_deltas(responses))
+
+
+def remove_surveys(responses):
+    """
+    Take survey responses out of the rollups, before they are deleted.
+
+    Args:
+        responses (list): SurveyResponse instances or column dicts
+    """
+    _apply(_deltas(responses, sign=-1))
+
+
+def move_profile(profile_id, old_diagnosis, new_diagnosis):
+    """
+    Move a profile's surveys to another diagnosis group after its diagnosis changed.
+
+    Args:
+        profile_id (int): Profile whose diagnosis changed
+        old_diagnosis (str): Previous clinical_diagnosis value
+        new_diagnosis (str): New clinical_diagnosis value
+    """
+    old_label, new_label = old_diagnosis or NOT_SPECIFIED, new_diagnosis or NOT_SPECIFIED
+    if old_label == new_label:
+        return
+
+    responses = SurveyResponse.query.filter_by(profile_id=profile_id).all()
+    deltas = _deltas(responses, {profile_id: old_label}, sign=-1)
+    _apply(_deltas(responses, {profile_id: new_label}, deltas=deltas))
+
+
+def compute_rollups():
+    """
+    Recompute every rollup row from survey_responses, in fetch batches.
+
+    Returns:
+        dict: (granularity, period_start, diagnosis) -> {column: value}
+    """
+    columns = [SurveyResponse.profile_id, SurveyResponse.date, *SURVEY_METRICS.values()]
+    labels = {
+        profile_id: diagnosis or NOT_SPECIFIED
+        for profile_id, diagnosis in db.session.query(StudentProfile.id, StudentProfile.clinical_diagnosis)
+    }
+
+    rollups = {}
+    batch = []
+    for row in db.session.query(*columns).execution_options(yield_per=REBUILD_BATCH_SIZE):
+        batch.append(row._asdict())
+        if len(batch) == REBUILD_BATCH_SIZE:
+            _deltas(batch, labels, deltas=rollups)
+            batch = []
+    _deltas(batch, labels, deltas=rollups)
+    return rollups
+
+
+def rebuild(write=True):
+    """
+    Recompute the rollup table from scratch and report drift.
+
+    Args:
+        write (bool): Replace the stored rows with the recomputed ones;
+            False only checks
+
+    Returns:
+        list: Human-readable drift descriptions, empty when in sync
+    """
+    return rebuild_table(SurveyRollup.__table__, KEY_COLUMNS, COUNTER_COLUMNS, dict.fromkeys(COUNTER_COLUMNS, 0),
+                         compute_rollups(), lambda key: " ".join(map(str, key)), write)
+
+
+rebuild_rollups_command = rebuild_command(
+    "rebuild-rollups", "survey_rollups", rebuild,
+    "Recompute survey_rollups from survey responses.",
+)
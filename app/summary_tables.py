@@ -0,0 +1,170 @@
+"""
+Summary Tables Module for PCOS Monitor System
+Upkeep shared by the tables that writers maintain alongside raw records.
+
+profile_aggregates (app/aggregates.py) and survey_rollups (app/rollups.py)
+are both updated in the writer's transaction, create their rows on first
+use, and can be recomputed from the raw tables with a drift report. The
+row creation, drift comparison, rebuild and its CLI command live here so
+both tables behave the same way.
+"""
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from .extensions import db
+
+# Keys per IN (...) lookup; three-column keys stay under SQLite's 999 bound parameters
+LOOKUP_BATCH_SIZE = 300
+
+# Relative tolerance when comparing stored and recomputed sums
+DRIFT_TOLERANCE = 1e-9
+
+# Drift lines printed by the rebuild commands
+DRIFT_REPORT_LINES = 50
+
+
+def _key_of(key_names, row):
+    """A row's key: the value itself for one key column, else a tuple."""
+    values = tuple(row[name] for name in key_names)
+    return values[0] if len(values) == 1 else values
+
+
+def lookup_rows(table, key_names, keys):
+    """
+    Primary keys of the stored rows for a set of keys.
+
+    Args:
+        table (Table): Summary table
+        key_names (list): Columns that identify a row; keys are plain
+            values for one column and tuples for several
+        keys (iterable): Keys to look up
+
+    Returns:
+        dict: key -> primary key, for the keys that have a row
+    """
+    primary = list(table.primary_key.columns)[0]
+    columns = [table.c[name] for name in key_names]
+    key_column = columns[0] if len(columns) == 1 else tuple_(*columns)
+    keys = sorted(keys)
+
+    ids = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        batch = keys[start:start + LOOKUP_BATCH_SIZE]
+        rows = db.session.execute(select(primary.label("pk"), *columns).where(key_column.in_(batch)))
+        ids.update((_key_of(key_names, row._mapping), row.pk) for row in rows)
+    return ids
+
+
+def ensure_rows(table, key_names, keys):
+    """
+    Create empty rows for keys that do not have one yet.
+
+    Args:
+        table (Table): Summary table
+        key_names (list): Columns that identify a row
+        keys (iterable): Keys that need a row
+
+    Returns:
+        dict: key -> primary key, for every key
+    """
+    keys = sorted(set(keys))
+    ids = lookup_rows(table, key_names, keys)
+    missing = [key for key in keys if key not in ids]
+    if not missing:
+        return ids
+
+    rows = [dict(zip(key_names, key if len(key_names) > 1 else (key,))) for key in missing]
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(table), rows)
+    except IntegrityError:
+        # A concurrent writer created some of them first; add the rest one by one
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(table), [row])
+            except IntegrityError:
+                pass
+
+    return lookup_rows(table, key_names, keys)
+
+
+def differs(stored, expected):
+    """Whether a stored value drifted from the recomputed one; sums compare within DRIFT_TOLERANCE."""
+    if stored is None or expected is None:
+        return stored != expected
+    if isinstance(expected, (int, float)):
+        return abs(stored - expected) > DRIFT_TOLERANCE * max(1.0, abs(expected))
+    return stored != expected
+
+
+def rebuild_table(table, key_names, columns, empty, expected, describe, write=True):
+    """
+    Compare a summary table with recomputed values and optionally replace it.
+
+    Args:
+        table (Table): Summary table
+        key_names (list): Columns that identify a row
+        columns (list): Value columns compared for drift
+        empty (dict): Column values of a key with no records
+        expected (dict): key -> {column: value} recomputed from the raw tables
+        describe (callable): key -> label used in drift descriptions
+        write (bool): Replace the stored rows with the recomputed ones;
+            False only checks
+
+    Returns:
+        list: Human-readable drift descriptions, empty when in sync
+    """
+    stored = {_key_of(key_names, row._mapping): row._asdict() for row in db.session.execute(select(table))}
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        want = {**empty, **expected.get(key, {})}
+        have = {**empty, **stored.get(key, {})}
+        for column in columns:
+            if differs(have[column], want[column]):
+                drift.append(f"{describe(key)}: {column} stored {have[column]!r}, expected {want[column]!r}")
+
+    if write:
+        db.session.execute(delete(table))
+        if expected:
+            db.session.execute(insert(table), [
+                {**dict(zip(key_names, key if len(key_names) > 1 else (key,))), **empty, **values}
+                for key, values in sorted(expected.items())
+            ])
+        db.session.commit()
+
+    return drift
+
+
+def rebuild_command(name, table_name, rebuild, help_text):
+    """
+    Flask CLI command that runs a table's rebuild() and prints the drift.
+
+    Args:
+        name (str): Command name, e.g. "rebuild-aggregates"
+        table_name (str): Table named in the summary line
+        rebuild (callable): The table's rebuild(write=True) function
+        help_text (str): Command help
+
+    Returns:
+        click.Command: Command to register with app.cli.add_command
+    """
+    @click.command(name, help=help_text)
+    @click.option("--check", is_flag=True, help="Only report drift; leave the table unchanged.")
+    @with_appcontext
+    def command(check):
+        drift = rebuild(write=not check)
+        for line in drift[:DRIFT_REPORT_LINES]:
+            click.echo(line)
+        if len(drift) > DRIFT_REPORT_LINES:
+            click.echo(f"... and {len(drift) - DRIFT_REPORT_LINES} more")
+
+        status = "Drift found" if drift else "No drift"
+        action = "checked" if check else "rebuilt"
+        click.echo(f"{status} ({len(drift)} values); {table_name} {action}.")
+
+    return command
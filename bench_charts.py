@@ -0,0 +1,74 @@
+"""
+Benchmark script for chart downsampling
+Compares payload size and server time for raw and downsampled chart data
+at 10k, 100k and 1M points
+
+Browser render time follows the number of points drawn (last column); it
+has to be measured in a real browser, which this script does not drive.
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.downsample import SERIES_MAX_POINTS, lttb, scatter_payload
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def timed(func):
+    """Run func once, returning (seconds, result)."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def raw_scatter(x, y, text):
+    return json.dumps({"x": x.tolist(), "y": y.tolist(), "text": text.tolist()})
+
+
+def raw_series(dates, values):
+    return json.dumps({"x": dates.strftime("%Y-%m-%d %H:%M:%S").tolist(), "y": values.tolist()})
+
+
+def downsampled_series(dates, values):
+    keep = lttb(dates.asi8, values, SERIES_MAX_POINTS)
+    return raw_series(dates[keep], values[keep])
+
+
+def bench_charts():
+    """Print payload MB, server seconds and points drawn for each size."""
+    rng = np.random.default_rng(42)
+
+    print("=" * 60)
+    print("BENCHMARK: chart downsampling")
+    print("=" * 60)
+    print(f"  {'chart':<8} {'points':>9} {'raw MB':>8} {'raw s':>7} {'down MB':>8} {'down s':>7} {'drawn':>7}")
+
+    for n in SIZES:
+        # Composite scores are means of 1-5 Likert items, so they sit on a grid
+        awareness = np.round(rng.integers(5, 26, n) / 5, 2)
+        pressure = np.round(np.clip(awareness + rng.normal(0, 1, n), 1, 5) * 3) / 3
+        text = np.array([f"profile_id: {i}<br>diagnosis: Yes" for i in range(n)], dtype=object)
+
+        raw_s, raw = timed(lambda: raw_scatter(awareness, pressure, text))
+        down_s, down = timed(lambda: json.dumps(scatter_payload(awareness, pressure, text)))
+        drawn = len(json.loads(down)["x"])
+        print(f"  {'scatter':<8} {n:>9} {len(raw) / 1e6:>8.2f} {raw_s:>7.2f} "
+              f"{len(down) / 1e6:>8.3f} {down_s:>7.2f} {drawn:>7}")
+
+        dates = pd.date_range("2024-01-01", periods=n, freq="min")
+        values = np.cumsum(rng.normal(size=n))
+        raw_s, raw = timed(lambda: raw_series(dates, values))
+        down_s, down = timed(lambda: downsampled_series(dates, values))
+        drawn = len(json.loads(down)["x"])
+        print(f"  {'series':<8} {n:>9} {len(raw) / 1e6:>8.2f} {raw_s:>7.2f} "
+              f"{len(down) / 1e6:>8.3f} {down_s:>7.2f} {drawn:>7}")
+
+    print("\n  Traces with at least WEBGL_MIN_POINTS points render with Scattergl.")
+
+
+if __name__ == "__main__":
+    bench_charts()
@@ -0,0 +1,113 @@
+"""
+Benchmark script for chunked CSV and Excel imports
+Runs import_file on generated CSV and .xlsx uploads of increasing size, each in a fresh
+process, and reports peak RSS so memory growth with file size is visible
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.jobs import import_file
+from app.models import User, ImportJob
+
+SOURCE_CSV = "cleaned_PCOS_Academic_Stress_Data (3).csv"
+# Copies of the bundled export per generated upload, by file format
+SCALES = {
+    ".csv": [100, 1000, 5000],
+    ".xlsx": [100, 1000],
+}
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_import_stream.db")
+    REPORT_CACHE_PATH = os.path.join(tempfile.mkdtemp(), "report_cache.sqlite")
+
+
+def write_upload(path, scale):
+    """Write the bundled survey export repeated `scale` times without holding it all in memory."""
+    source = pd.read_csv(SOURCE_CSV)
+
+    # Tag each copy so rows stay distinct for the duplicate check
+    if path.endswith(".xlsx"):
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(list(source.columns) + ["Copy"])
+        rows = source.astype(object).where(source.notna(), None).values.tolist()
+        for copy in range(scale):
+            for row in rows:
+                sheet.append(row + [copy])
+        workbook.save(path)
+        return
+
+    with open(path, "w", newline="") as handle:
+        source.assign(Copy=0).to_csv(handle, index=False)
+        for copy in range(1, scale):
+            source.assign(Copy=copy).to_csv(handle, index=False, header=False)
+
+
+def run_one(path):
+    """Import one file in this process and print rows, seconds and peak RSS."""
+    app = create_app(BenchConfig)
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="bench@pcos.research", password_hash="x", is_admin=True)
+        db.session.add(admin)
+        db.session.flush()
+        job = ImportJob(user_id=admin.id, filename=os.path.basename(path), status="running",
+                        processed_rows=0, created_rows=0, skipped_rows=0)
+        db.session.add(job)
+        db.session.commit()
+
+        start = time.perf_counter()
+        import_file(job, path)
+        elapsed = time.perf_counter() - start
+
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(job.processed_rows, job.created_rows, f"{elapsed:.2f}", f"{peak_mb:.1f}")
+
+
+def bench_one(path, scale):
+    """Generate one upload, import it in a child process and print the results."""
+    write_upload(path, scale)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+
+    output = subprocess.run([sys.executable, __file__, path], check=True,
+                            capture_output=True, text=True).stdout.split()
+    rows, created, seconds, peak_mb = output[-4:]
+    os.remove(path)
+
+    print(f"\n  File:       {size_mb:,.1f} MB ({int(rows):,} rows)")
+    print(f"  Created:    {int(created):,}")
+    print(f"  Seconds:    {seconds}")
+    print(f"  Peak RSS:   {peak_mb} MB")
+
+
+def bench_import_stream():
+    """Generate uploads and import each one in a child process."""
+    print("=" * 60)
+    print("BENCHMARK: chunked CSV/.xlsx import, peak RSS by file size")
+    print("=" * 60)
+
+    workdir = tempfile.mkdtemp()
+    for extension, scales in SCALES.items():
+        for scale in scales:
+            bench_one(os.path.join(workdir, f"upload_{scale}{extension}"), scale)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_one(sys.argv[1])
+    else:
+        bench_import_stream()
@@ -0,0 +1,134 @@
+"""
+Benchmark script for the per-profile lookup indexes
+Compares query plans and latency with and without the secondary indexes
+on a large synthetic SQLite database
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse
+
+N_PROFILES = 20000
+RECORDS_PER_PROFILE = 6
+SURVEYS_PER_PROFILE = 30
+LOOKUPS = 300
+INDEXED_TABLES = [StudentProfile.__table__, AcademicRecord.__table__, SurveyResponse.__table__]
+
+HOT_QUERIES = {
+    "academic by profile": (
+        "SELECT * FROM academic_records WHERE profile_id = :id ORDER BY created_at"
+    ),
+    "surveys by profile": (
+        "SELECT * FROM survey_responses WHERE profile_id = :id ORDER BY date"
+    ),
+    "profile by user (current_user.profile)": (
+        "SELECT * FROM student_profiles WHERE user_id = :id"
+    ),
+    "profiles by diagnosis": (
+        "SELECT count(*) FROM student_profiles WHERE clinical_diagnosis = 'Yes'"
+    ),
+}
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_indexes.db")
+    REPORT_CACHE_PATH = os.path.join(tempfile.mkdtemp(), "report_cache.sqlite")
+
+
+def seed(seed=42):
+    """Fill the database with a synthetic cohort using bulk inserts."""
+    rng = random.Random(seed)
+    start_date = datetime(2023, 1, 1)
+
+    db.session.execute(insert(User), [
+        {"id": i, "email": f"bench{i}@pcos.research", "password_hash": "x"}
+        for i in range(1, N_PROFILES + 1)
+    ])
+    db.session.execute(insert(StudentProfile), [{
+        "id": i, "user_id": i, "clinical_diagnosis": rng.choice(["Yes", "No", "Not sure"])
+    } for i in range(1, N_PROFILES + 1)])
+    db.session.execute(insert(AcademicRecord), [{
+        "profile_id": rng.randint(1, N_PROFILES),
+        "gpa": rng.uniform(1, 4),
+        "created_at": start_date + timedelta(days=rng.randint(0, 700))
+    } for _ in range(N_PROFILES * RECORDS_PER_PROFILE)])
+    db.session.execute(insert(SurveyResponse), [{
+        "profile_id": rng.randint(1, N_PROFILES),
+        "date": start_date + timedelta(days=rng.randint(0, 700)),
+        "fatigue": rng.randint(1, 5)
+    } for _ in range(N_PROFILES * SURVEYS_PER_PROFILE)])
+    db.session.commit()
+
+
+def set_indexes(enabled):
+    """Create or drop every secondary index declared on the models."""
+    for table in INDEXED_TABLES:
+        for index in table.indexes:
+            if enabled:
+                index.create(db.engine, checkfirst=True)
+            else:
+                index.drop(db.engine, checkfirst=True)
+    with db.engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def measure():
+    """Return {query name: (plan, ms per lookup)} for every hot query."""
+    rng = random.Random(7)
+    ids = [rng.randint(1, N_PROFILES) for _ in range(LOOKUPS)]
+    results = {}
+
+    with db.engine.connect() as conn:
+        for name, sql in HOT_QUERIES.items():
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), {"id": ids[0]}).fetchall()
+            plan = "; ".join(row[-1] for row in plan)
+
+            start = time.perf_counter()
+            for profile_id in ids:
+                conn.execute(text(sql), {"id": profile_id}).fetchall()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / LOOKUPS
+
+            results[name] = (plan, elapsed_ms)
+
+    return results
+
+
+def bench_indexes():
+    """Print query plans and per-lookup latency before and after indexing."""
+    app = create_app(BenchConfig)
+
+    with app.app_context():
+        print("=" * 60)
+        print("BENCHMARK: per-profile lookup indexes")
+        print("=" * 60)
+        print(f"  {N_PROFILES} profiles, {N_PROFILES * RECORDS_PER_PROFILE} academic records, "
+              f"{N_PROFILES * SURVEYS_PER_PROFILE} surveys")
+
+        db.create_all()
+        seed()
+
+        set_indexes(False)
+        before = measure()
+        set_indexes(True)
+        after = measure()
+
+        for name in HOT_QUERIES:
+            plan_before, ms_before = before[name]
+            plan_after, ms_after = after[name]
+            print(f"\n  {name}:")
+            print(f"    without indexes: {ms_before:8.3f} ms  [{plan_before}]")
+            print(f"    with indexes:    {ms_after:8.3f} ms  [{plan_after}]")
+            print(f"    speedup:         {ms_before / ms_after:8.1f}x")
+
+
+if __name__ == "__main__":
+    bench_indexes()
@@ -0,0 +1,108 @@
+"""
+Benchmark script for Reports Module
+Times the report aggregation paths on synthetic cohorts of increasing size
+"""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app
+from app import aggregates, rollups
+from app.config import Config
+from app.extensions import db, report_cache
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse
+from app.reports import ReportGenerator
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+RECORDS_PER_PROFILE = 4
+SURVEYS_PER_PROFILE = 12
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    REPORT_CACHE_PATH = os.path.join(tempfile.mkdtemp(), "report_cache.sqlite")
+
+
+def seed(n_profiles, seed=42):
+    """Fill the current database with a synthetic cohort using bulk inserts."""
+    rng = random.Random(seed)
+    start_date = datetime(2024, 1, 1)
+
+    db.drop_all()
+    db.create_all()
+    db.session.execute(insert(User), [
+        {"id": i + 1, "email": f"bench{i}@pcos.research", "password_hash": "x"}
+        for i in range(n_profiles)
+    ])
+    db.session.execute(insert(StudentProfile), [{
+        "id": i + 1,
+        "user_id": i + 1,
+        "age": rng.randint(17, 25),
+        "clinical_diagnosis": rng.choice(["Yes", "No", "Not sure"]),
+        "pcos_awareness_score": rng.uniform(1, 5),
+        "academic_pressure_score": rng.uniform(1, 5),
+        "pcos_symptoms_score": rng.uniform(1, 5)
+    } for i in range(n_profiles)])
+    db.session.execute(insert(AcademicRecord), [{
+        "profile_id": rng.randint(1, n_profiles),
+        "gpa": rng.uniform(1, 4),
+        "attendance_percent": rng.uniform(60, 100),
+        "study_hours_per_week": rng.uniform(0, 30)
+    } for _ in range(n_profiles * RECORDS_PER_PROFILE)])
+    db.session.execute(insert(SurveyResponse), [{
+        "profile_id": rng.randint(1, n_profiles),
+        "date": start_date + timedelta(days=rng.randint(0, 365)),
+        "fatigue": rng.randint(0, 5),
+        "mood_swings": rng.randint(0, 5),
+        "sleep_quality": rng.randint(0, 5),
+        "perceived_academic_stress": rng.randint(0, 5)
+    } for _ in range(n_profiles * SURVEYS_PER_PROFILE)])
+    db.session.commit()
+    aggregates.rebuild()
+    rollups.rebuild()
+    report_cache.bump_version()
+
+
+def timed(func):
+    """Run func once, returning (seconds, peak traced memory in MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def bench_reports():
+    """Time correlation analysis and the full report package per cohort size."""
+    app = create_app(BenchConfig)
+
+    with app.app_context():
+        print("=" * 60)
+        print("BENCHMARK: ReportGenerator")
+        print("=" * 60)
+        print(f"  {'profiles':>8} {'rows':>8} {'corr s':>8} {'us/prof':>8} {'full s':>8} {'peak MB':>8}")
+
+        for n in SIZES:
+            seed(n)
+            rows = n * (1 + RECORDS_PER_PROFILE + SURVEYS_PER_PROFILE)
+            generator = ReportGenerator()
+
+            corr_s, _ = timed(generator.get_correlation_analysis)
+            full_s, peak_mb = timed(generator.generate_full_report_data)
+
+            print(f"  {n:>8} {rows:>8} {corr_s:>8.3f} {corr_s / n * 1e6:>8.1f} {full_s:>8.3f} {peak_mb:>8.2f}")
+
+        print("\n  Linear scaling shows as a roughly constant us/prof column;")
+        print("  peak MB grows with profile count only, not with survey rows.")
+
+
+if __name__ == "__main__":
+    bench_reports()
@@ -0,0 +1,88 @@
+"""
+Benchmark script for worker startup
+Measures what `from app import create_app; create_app()` imports, using
+`python -X importtime`, and fails when it goes over budget
+
+Each run happens in a fresh interpreter, like a new gunicorn worker. The
+first dashboard and report requests are timed too, since that is where
+the deferred imports are paid.
+"""
+
+import subprocess
+import sys
+
+# Cumulative import time of the app package, best of RUNS (seconds)
+IMPORT_BUDGET_SECONDS = 1.0
+
+# Modules that must not be imported until their first request needs them
+DEFERRED_MODULES = ["dash", "plotly", "pandas", "numpy", "scipy", "reportlab", "openpyxl"]
+
+RUNS = 5
+
+STARTUP = "from app import create_app; app = create_app()"
+
+CHECK = STARTUP + """
+import sys
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+FIRST_REQUESTS = STARTUP + """
+import time
+client = app.test_client()
+for path in ("/dashboard/", "/dashboard/_dash-layout"):
+    start = time.perf_counter()
+    status = client.get(path).status_code
+    print(f"{path} {status} {time.perf_counter() - start:.2f}")
+"""
+
+
+def import_times(code):
+    """Run code under -X importtime; returns {module: cumulative seconds}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def bench_startup():
+    """Print import times per app module and check them against the budget."""
+    print("=" * 60)
+    print("BENCHMARK: worker startup imports")
+    print("=" * 60)
+
+    runs = [import_times(STARTUP) for _ in range(RUNS)]
+    best = min(runs, key=lambda times: times["app"])
+    for name in sorted(best, key=best.get, reverse=True):
+        if name.startswith("app") or name in DEFERRED_MODULES:
+            print(f"  {name:<24} {best[name]:>6.3f} s")
+
+    loaded = subprocess.run([sys.executable, "-c", CHECK.format(modules=DEFERRED_MODULES)],
+                            capture_output=True, text=True, check=True).stdout.strip()
+
+    print("\n  First requests in a fresh worker:")
+    output = subprocess.run([sys.executable, "-c", FIRST_REQUESTS],
+                            capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        path, status, seconds = line.split()
+        print(f"  {path:<24} {seconds:>6} s  (HTTP {status})")
+
+    failures = []
+    if best["app"] > IMPORT_BUDGET_SECONDS:
+        failures.append(f"app imports take {best['app']:.3f} s (budget {IMPORT_BUDGET_SECONDS} s)")
+    if loaded:
+        failures.append(f"imported at startup: {loaded}")
+
+    print(f"\n  app package: {best['app']:.3f} s of {IMPORT_BUDGET_SECONDS} s budget")
+    for failure in failures:
+        print(f"  ✗ {failure}")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if bench_startup() else 1)
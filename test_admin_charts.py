@@ -0,0 +1,86 @@
+"""
+Test script for the admin charts page
+Checks that the page issues a fixed number of queries regardless of cohort size
+"""
+
+from sqlalchemy import event, insert
+
+from app.aggregates import rebuild
+from app.extensions import db
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse
+from testing import login, make_app
+
+
+def add_students(start, count):
+    """Bulk insert students, each with one academic record and two surveys."""
+    ids = range(start, start + count)
+    db.session.execute(insert(User), [
+        {"id": i, "email": f"student{i}@pcos.research", "password_hash": "x"} for i in ids
+    ])
+    db.session.execute(insert(StudentProfile), [{
+        "id": i, "user_id": i, "clinical_diagnosis": "Yes" if i % 2 else "No",
+        "pcos_awareness_score": 1 + i % 4, "academic_pressure_score": 1 + i % 3,
+        "pcos_symptoms_score": 1 + i % 5
+    } for i in ids])
+    db.session.execute(insert(AcademicRecord), [
+        {"profile_id": i, "gpa": 1 + i % 3, "attendance_percent": 80 + i % 20} for i in ids
+    ])
+    db.session.execute(insert(SurveyResponse), [
+        {"profile_id": i, "fatigue": 1 + (i + k) % 5, "perceived_academic_stress": 1 + k}
+        for i in ids for k in range(2)
+    ])
+    db.session.commit()
+    rebuild()
+
+
+def count_queries(client):
+    """Load the charts page and return the number of SQL statements it ran."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/admin/charts")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_charts_query_count():
+    """Test that the charts page query count does not grow with profiles."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        admin = User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+
+        client = login(app, 1)
+
+        print("=" * 60)
+        print("Testing Admin Charts Query Count")
+        print("=" * 60)
+
+        counts = []
+        total = 0
+        for size in (5, 50, 500):
+            add_students(total + 2, size - total)
+            total = size
+            counts.append(count_queries(client))
+            print(f"   - {size:>4} profiles: {counts[-1]} queries")
+
+        assert len(set(counts)) == 1, f"Query count grows with profiles: {counts}"
+        print(f"   ✓ Constant query count ({counts[0]})")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_charts_query_count()
@@ -0,0 +1,120 @@
+"""
+Test script for bulk JSON ingestion
+Checks per-item validation results, single-transaction inserts, and that
+aggregates and rollups match a full rebuild afterwards
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import event
+
+from app import aggregates, rollups
+from app.extensions import db
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse
+from testing import login, make_app
+
+
+def test_bulk_ingest():
+    """Test bulk submissions from a student and an admin."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        db.session.add(User(id=2, email="student@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=2, user_id=2, awareness_1=3, clinical_diagnosis="Yes"))
+        db.session.add(User(id=3, email="other@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=3, user_id=3, awareness_1=3))
+        db.session.commit()
+
+        commits = []
+        event.listen(db.engine, "commit", lambda conn: commits.append(1))
+
+    print("=" * 60)
+    print("Testing Bulk Ingestion")
+    print("=" * 60)
+
+    # Step 1: thousands of valid items are stored with one commit
+    print("\n1. Student batch...")
+    rng = np.random.default_rng(5)
+    start = datetime(2024, 1, 1)
+    items = [{
+        "type": "survey",
+        "date": (start + timedelta(hours=int(hours))).isoformat() + "Z",
+        "fatigue": int(rng.integers(1, 6)), "mood_swings": int(rng.integers(1, 6)),
+        "sleep_quality": int(rng.integers(1, 6)), "perceived_academic_stress": int(rng.integers(1, 6)),
+        "acne": bool(hours % 2),
+    } for hours in rng.integers(0, 24 * 365, 3000)]
+    items += [{"type": "academic", "term": f"2024 - {i}", "gpa": round(float(rng.uniform(1, 5)), 2),
+               "attendance_percent": 90} for i in range(200)]
+    items.append({"type": "survey", "fatigue": 3, "mood_swings": 3, "sleep_quality": 3,
+                  "perceived_academic_stress": 3, "notes": "no date"})
+
+    client = login(app, 2)
+    began = time.perf_counter()
+    response = client.post("/api/submissions", json=items)
+    elapsed = time.perf_counter() - began
+    result = response.get_json()
+    assert response.status_code == 200 and result["created"] == len(items) and result["failed"] == 0
+    assert len(commits) == 1
+    assert [r["index"] for r in result["results"]] == list(range(len(items)))
+    with app.app_context():
+        assert SurveyResponse.query.filter_by(profile_id=2).count() == 3001
+        assert AcademicRecord.query.count() == 200
+        last = db.session.get(SurveyResponse, result["results"][-1]["id"])
+        assert last.notes == "no date" and last.acne is False
+        assert db.session.get(SurveyResponse, result["results"][0]["id"]).date == datetime.fromisoformat(items[0]["date"][:-1])
+        assert aggregates.rebuild(write=False) == [] and rollups.rebuild(write=False) == []
+    print(f"   ✓ {len(items)} items in one transaction ({elapsed:.2f}s); aggregates and rollups consistent")
+
+    # Step 2: invalid items are reported by position, valid ones still stored
+    print("\n2. Mixed batch...")
+    commits.clear()
+    survey = {"type": "survey", "fatigue": 2, "mood_swings": 2, "sleep_quality": 2, "perceived_academic_stress": 2}
+    response = client.post("/api/submissions", json=[
+        survey,
+        {**survey, "fatigue": 7},
+        {**survey, "profile_id": 3},
+        {**survey, "date": "last tuesday", "colour": "red"},
+        {"type": "academic", "gpa": 6},
+        {"type": "poll"},
+        "not an object",
+        {**survey, "fatigue": True},
+        {"type": "academic", "term": "2024 - 1", "gpa": False},
+    ])
+    result = response.get_json()
+    assert result["created"] == 1 and result["failed"] == 8 and len(commits) == 1
+    errors = [r.get("errors") for r in result["results"]]
+    assert errors[0] is None and result["results"][0]["status"] == "created"
+    assert errors[1] == ["fatigue must be a whole number from 1 to 5"]
+    assert errors[2] == ["You can only submit data for your own profile"]
+    assert set(errors[3]) == {"Unknown field for survey items: colour", "date must be an ISO 8601 date or datetime"}
+    assert set(errors[4]) == {"term is required", "gpa must be a number from 0 to 5"}
+    assert errors[5] == ["type must be one of: survey, academic"] and errors[6] == ["Item must be a JSON object"]
+    assert errors[7] == ["fatigue must be a whole number from 1 to 5"]  # not stored as rating 1
+    assert errors[8] == ["gpa must be a number from 0 to 5"]
+    print("   ✓ One stored, eight rejected with their reasons")
+
+    # Step 3: admins submit for any existing profile, named on every item
+    print("\n3. Admin batch and bad requests...")
+    admin = login(app, 1)
+    result = admin.post("/api/submissions", json=[
+        {**survey, "profile_id": 3}, survey, {**survey, "profile_id": 99}, {**survey, "profile_id": 10 ** 30},
+    ]).get_json()
+    assert [r["status"] for r in result["results"]] == ["created", "invalid", "invalid", "invalid"]
+    assert result["results"][1]["errors"] == ["profile_id is required"]
+    assert result["results"][2]["errors"] == result["results"][3]["errors"] == ["Unknown profile_id"]
+    assert admin.post("/api/submissions", json={"items": []}).status_code == 400
+    assert admin.post("/api/submissions", json=[]).status_code == 400
+    assert app.test_client().post("/api/submissions", json=[survey]).status_code in (302, 401)
+    print("   ✓ Profiles checked; malformed and anonymous requests rejected")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_bulk_ingest()
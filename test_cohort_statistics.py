@@ -0,0 +1,110 @@
+"""
+Test script for the cohort statistics service
+Checks means and percentile ranks against numpy, incremental updates,
+reloads in other workers, and the dashboard comparison
+"""
+
+import numpy as np
+from sqlalchemy import event
+
+from app.cohort import CohortStatistics, cohort_statistics, profile_scores
+from app.extensions import db
+from app.models import User, StudentProfile
+from testing import login, make_app
+
+
+def expected(profiles, own, column):
+    """Mean and percentile rank of own among the other profiles, computed directly."""
+    others = np.array([getattr(p, column) for p in profiles if p.id != own.id and getattr(p, column)])
+    value = getattr(own, column)
+    rank = round(100 * ((others < value).sum() + 0.5 * (others == value).sum()) / len(others))
+    return round(others.mean(), 2), rank
+
+
+def test_cohort_statistics():
+    """Test cohort means, percentile ranks and incremental updates."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        rng = np.random.default_rng(23)
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        for i in range(1, 301):
+            if i > 1:
+                db.session.add(User(id=i, email=f"s{i}@pcos.research", password_hash="x"))
+            scores = np.round(rng.integers(5, 26, 3) / 5, 2)
+            db.session.add(StudentProfile(
+                id=i, user_id=i, awareness_1=3,
+                pcos_awareness_score=float(scores[0]) if i % 10 else None,
+                academic_pressure_score=float(scores[1]) if i % 7 else 0.0,
+                pcos_symptoms_score=float(scores[2]),
+            ))
+        db.session.commit()
+
+        print("=" * 60)
+        print("Testing Cohort Statistics")
+        print("=" * 60)
+
+        # Step 1: summary matches a direct computation over the other profiles
+        print("\n1. Comparing with numpy...")
+        profiles = StudentProfile.query.all()
+        service = cohort_statistics()
+        own = db.session.get(StudentProfile, 3)
+        stats = service.summary(own)
+        assert stats["cohort_size"] == 299
+        for metric, column in (("awareness", "pcos_awareness_score"),
+                               ("academic_pressure", "academic_pressure_score"),
+                               ("symptoms", "pcos_symptoms_score")):
+            mean, rank = expected(profiles, own, column)
+            assert stats[f"avg_{metric}"] == mean and stats["percentiles"][metric] == rank
+        assert service.summary(db.session.get(StudentProfile, 10))["percentiles"]["awareness"] is None
+        print(f"   ✓ Means and ranks match (academic pressure: {stats['percentiles']['academic_pressure']}th)")
+
+        # Step 2: changes are applied in place, without reloading the cohort
+        print("\n2. Incremental updates...")
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+        changed = db.session.get(StudentProfile, 20)
+        before = profile_scores(changed)
+        changed.academic_pressure_score = 5.0
+        changed.pcos_awareness_score = None
+        db.session.commit()
+        service.record_change(before, profile_scores(changed))
+        removed = db.session.get(StudentProfile, 30)
+        service.record_change(profile_scores(removed), None)
+        db.session.delete(removed)
+        db.session.commit()
+
+        db.session.refresh(own)
+        statements.clear()
+        incremental = service.summary(own)
+        assert not [sql for sql in statements if "student_profiles" in sql]
+        fresh = CohortStatistics()
+        assert fresh.summary(own) == incremental
+        print("   ✓ Same results as a fresh load, with no profile query")
+
+        # Step 3: another worker notices the shared counter and reloads
+        print("\n3. Other workers...")
+        before = profile_scores(own)
+        own.pcos_symptoms_score = 5.0
+        db.session.commit()
+        service.record_change(before, profile_scores(own))
+        assert fresh.summary(own)["percentiles"]["symptoms"] == service.summary(own)["percentiles"]["symptoms"]
+        assert fresh.summary(own)["percentiles"]["symptoms"] > stats["percentiles"]["symptoms"]
+        print("   ✓ Reloaded after the cohort version changed")
+
+    # Step 4: the dashboard shows the percentile rank
+    print("\n4. Student dashboard...")
+    client = login(app, 1)
+    response = client.get("/my-dashboard")
+    assert response.status_code == 200
+    assert b"percentile for academic pressure" in response.data
+    print("   ✓ Percentile rank rendered")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_cohort_statistics()
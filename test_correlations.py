@@ -0,0 +1,113 @@
+"""
+Test script for the correlation engine
+Compares the single-pass matrices with pandas and scipy pairwise results
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr, rankdata, spearmanr
+
+from app import correlations
+from app.correlations import _bootstrap_batch, _resample_weights, bootstrap_ci, correlate
+
+
+def make_frame(size=200, seed=3):
+    """Synthetic profile features with different missing values per column."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.integers(1, 6, (size, 5)).astype(float),
+                      columns=["awareness", "academic_pressure", "symptoms", "gpa", "fatigue"])
+    df["symptoms"] = df["academic_pressure"] + rng.normal(0, 1, size)
+    df.loc[rng.random(size) < 0.2, "symptoms"] = np.nan
+    df.loc[rng.random(size) < 0.2, "academic_pressure"] = np.nan
+    df.loc[rng.random(size) < 0.6, ["gpa", "fatigue"]] = np.nan
+    return df
+
+
+def test_correlation_engine():
+    """Test that every matrix cell matches a pairwise-complete scipy call."""
+    print("=" * 60)
+    print("Testing Correlation Engine")
+    print("=" * 60)
+
+    df = make_frame()
+    matrix = correlate(df, list(df.columns))
+
+    # Step 1: coefficients match pandas' pairwise-complete matrices
+    print("\n1. Comparing with DataFrame.corr...")
+    for method in ("spearman", "pearson"):
+        expected = df.corr(method=method)
+        assert np.allclose(matrix.r[method], expected, equal_nan=True), method
+    print("   ✓ Spearman and Pearson matrices match")
+
+    # Step 2: p-values and counts match scipy on each dropna'd pair
+    print("\n2. Comparing p-values with scipy...")
+    for x in df.columns:
+        for y in df.columns:
+            if x == y:
+                continue
+            pair = df[[x, y]].dropna()
+            assert matrix.n.at[x, y] == len(pair)
+            assert np.isclose(matrix.p["spearman"].at[x, y], spearmanr(pair[x], pair[y]).pvalue)
+            assert np.isclose(matrix.p["pearson"].at[x, y], pearsonr(pair[x], pair[y]).pvalue)
+    print("   ✓ P-values and pairwise counts match")
+
+    # Step 3: symptoms/pressure use aligned rows; dropping each column
+    # independently gives arrays of different lengths
+    print("\n3. Checking row alignment...")
+    corr, _, n = matrix.pair("symptoms", "academic_pressure")
+    assert n < min(df["symptoms"].notna().sum(), df["academic_pressure"].notna().sum())
+    try:
+        spearmanr(df["symptoms"].dropna(), df["academic_pressure"].dropna())
+        raise AssertionError("Independently dropped columns should not line up")
+    except ValueError:
+        pass
+    print(f"   ✓ r = {corr:.3f} on {n} complete pairs")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+def test_bootstrap_ci():
+    """Test that batched bootstrap resamples match explicit resampling."""
+    print("=" * 60)
+    print("Testing Bootstrap Confidence Intervals")
+    print("=" * 60)
+
+    pair = make_frame()[["symptoms", "academic_pressure"]].dropna()
+    x, y = pair["symptoms"].to_numpy(), pair["academic_pressure"].to_numpy()
+
+    # Step 1: weighted midranks equal ranking each resample explicitly
+    print("\n1. Comparing with explicit resamples...")
+    seed = np.random.SeedSequence(11)
+    weights = _resample_weights(np.random.default_rng(seed), len(x), 25)
+    picks = [np.repeat(np.arange(len(x)), row.astype(int)) for row in weights]
+    expected = [np.corrcoef(rankdata(x[i]), rankdata(y[i]))[0, 1] for i in picks]
+    assert np.allclose(_bootstrap_batch(x, y, "spearman", 25, seed), expected)
+    expected = [np.corrcoef(x[i], y[i])[0, 1] for i in picks]
+    assert np.allclose(_bootstrap_batch(x, y, "pearson", 25, seed), expected)
+    print("   ✓ Spearman and Pearson resamples match")
+
+    # Step 2: seeded intervals are reproducible and cover the estimate
+    print("\n2. Checking reproducibility...")
+    correlations.BOOTSTRAP_BATCH_CELLS = len(x) * 500  # four batches
+    try:
+        low, high = bootstrap_ci(x, y, n_resamples=2000, seed=7)
+        assert (low, high) == bootstrap_ci(x, y, n_resamples=2000, seed=7)
+        assert (low, high) == bootstrap_ci(x, y, n_resamples=2000, seed=7, processes=2)
+    finally:
+        correlations.BOOTSTRAP_BATCH_CELLS = 2_000_000
+    assert low < spearmanr(x, y).statistic < high
+    print(f"   ✓ 95% CI [{low:.3f}, {high:.3f}] identical in-process and pooled")
+
+    assert np.isnan(bootstrap_ci(x[:2], y[:2])).all()
+    print("   ✓ Too few observations gives no interval")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_correlation_engine()
+    test_bootstrap_ci()
@@ -0,0 +1,79 @@
+"""
+Test script for chart downsampling
+Checks LTTB against a straightforward implementation and scatter binning totals
+"""
+
+import math
+
+import numpy as np
+
+from app.downsample import WEBGL_MIN_POINTS, bin_scatter, lttb, scatter_payload
+
+
+def reference_lttb(x, y, threshold):
+    """Textbook LTTB, one point at a time."""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    anchor, keep = 0, [0]
+    for i in range(threshold - 2):
+        next_start = int(math.floor((i + 1) * every)) + 1
+        next_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        if next_end > next_start:
+            mean_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            mean_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        else:
+            mean_x, mean_y = x[-1], y[-1]
+
+        start, end = int(math.floor(i * every)) + 1, int(math.floor((i + 1) * every)) + 1
+        areas = [abs((x[anchor] - mean_x) * (y[j] - y[anchor]) - (x[anchor] - x[j]) * (mean_y - y[anchor]))
+                 for j in range(start, end)]
+        anchor = start + areas.index(max(areas))
+        keep.append(anchor)
+    return keep + [n - 1]
+
+
+def test_downsample():
+    """Test LTTB selection, binning and scatter payloads."""
+    print("=" * 60)
+    print("Testing Chart Downsampling")
+    print("=" * 60)
+
+    rng = np.random.default_rng(8)
+
+    # Step 1: vectorized LTTB picks the same points as the reference
+    print("\n1. Comparing LTTB with the reference...")
+    for n, threshold in ((1000, 100), (5003, 211), (10, 5)):
+        x = np.sort(rng.uniform(0, 100, n))
+        y = np.cumsum(rng.normal(size=n))
+        assert lttb(x, y, threshold).tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+    print("   ✓ Same indices; short series returned whole")
+
+    # Step 2: binning keeps every point's weight and the means inside their bins
+    print("\n2. Binning scatter points...")
+    x, y = rng.normal(size=50000), rng.normal(size=50000)
+    bin_x, bin_y, counts = bin_scatter(x, y, bins=50)
+    assert counts.sum() == 50000 and len(counts) <= 50 * 50
+    assert np.isclose((bin_x * counts).sum() / counts.sum(), x.mean())
+    print(f"   ✓ {len(counts)} occupied bins for 50,000 points")
+
+    # Step 3: payloads bin past the limit and switch to WebGL
+    print("\n3. Building scatter payloads...")
+    small = scatter_payload([1, 2, np.nan, 4], [2, 4, 5, 8], text=["a", "b", "c", "d"])
+    assert not small["binned"] and not small["webgl"] and small["text"] == ["a", "b", "d"]
+    assert np.allclose(small["trend"]["y"], [2, 8])
+
+    large = scatter_payload(x, y + x, max_points=10000)
+    assert large["binned"] and large["n"] == 50000 and sum(large["count"]) == 50000
+    assert large["webgl"] == (len(large["x"]) >= WEBGL_MIN_POINTS)
+    slope = (large["trend"]["y"][1] - large["trend"]["y"][0]) / (large["trend"]["x"][1] - large["trend"]["x"][0])
+    assert abs(slope - 1) < 0.05  # trend fitted on all points, not the bins
+    print(f"   ✓ {large['n']} points sent as {len(large['x'])} bins (webgl={large['webgl']})")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_downsample()
@@ -0,0 +1,71 @@
+"""
+Test script for diagnosis group comparisons
+Checks the batched Kruskal-Wallis permutation tests against scipy
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kruskal
+
+from app.group_tests import diagnosis_group_tests, holm_adjust, kruskal_permutation
+
+
+def make_features(size=300, seed=5):
+    """Synthetic profiles where only awareness differs by diagnosis."""
+    rng = np.random.default_rng(seed)
+    diagnosis = rng.choice(["Yes", "No", "Not sure", None], size)
+    features = pd.DataFrame({
+        "diagnosis": diagnosis,
+        "awareness": np.round(rng.normal(3, 1, size) + (diagnosis == "Yes") * 1.0, 1),
+        "academic_pressure": np.round(rng.normal(3, 1, size), 1),
+        "symptoms": np.round(rng.normal(3, 1, size), 1),
+    })
+    features.loc[:20, "symptoms"] = np.nan
+    return features
+
+
+def test_group_tests():
+    """Test H statistics, permutation p-values and Holm adjustment."""
+    print("=" * 60)
+    print("Testing Diagnosis Group Comparisons")
+    print("=" * 60)
+
+    features = make_features()
+    groups = features["diagnosis"].fillna("Not Specified")
+
+    # Step 1: H and the asymptotic p-value match scipy (with tie correction)
+    print("\n1. Comparing with scipy.stats.kruskal...")
+    for metric in ("awareness", "academic_pressure", "symptoms"):
+        result = kruskal_permutation(features[metric], groups, n_permutations=2000, seed=1)
+        present = features[metric].notna()
+        expected = kruskal(*[features.loc[present & (groups == g), metric] for g in groups.unique()])
+        assert np.isclose(result["h_statistic"], expected.statistic)
+        assert np.isclose(result["p_value"], expected.pvalue)
+        assert result["n"] == present.sum()
+    print("   ✓ H statistics and p-values match")
+
+    # Step 2: permutation p-values are reproducible and agree with the asymptotic ones
+    print("\n2. Checking permutation p-values...")
+    results = diagnosis_group_tests(features, n_permutations=5000, seed=3)
+    assert results == diagnosis_group_tests(features, n_permutations=5000, seed=3)
+    assert results["awareness"]["permutation_p"] < 0.001
+    assert results["academic_pressure"]["permutation_p"] > 0.01
+    for result in results.values():
+        assert abs(result["permutation_p"] - result["p_value"]) < 0.03
+    print(f"   ✓ Awareness differs (p = {results['awareness']['permutation_p']:.4f}, "
+          f"epsilon² = {results['awareness']['epsilon_squared']:.3f})")
+
+    # Step 3: Holm adjustment
+    print("\n3. Checking Holm adjustment...")
+    assert holm_adjust({"a": 0.01, "b": 0.04, "c": 0.03}) == {"a": 0.03, "c": 0.06, "b": 0.06}
+    for result in results.values():
+        assert result["p_adjusted"] >= result["permutation_p"]
+    print("   ✓ Adjusted p-values are monotone and never smaller than raw")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_group_tests()
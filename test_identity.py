@@ -0,0 +1,119 @@
+"""
+Test script for the cached identity loader
+Checks the joined user/profile query, per-worker cache hits, the baseline
+session marker, and invalidation after profile changes in this worker and
+in others
+"""
+
+import os
+import tempfile
+
+from sqlalchemy import event
+
+from app.extensions import db, report_cache
+from app.identity import BASELINE_SESSION_KEY, IDENTITY_VERSION_KEY, identity_cache
+from app.models import User, StudentProfile
+from testing import login, make_app
+
+
+def make_worker(directory):
+    """An app instance; apps made on the same directory act as workers sharing one database."""
+    return make_app(SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(directory, "identity.db"),
+                    REPORT_CACHE_PATH=os.path.join(directory, "report_cache.sqlite"),
+                    WTF_CSRF_ENABLED=False)
+
+
+def test_identity():
+    """Test identity caching, the baseline marker and invalidation."""
+    directory = tempfile.mkdtemp()
+    app = make_worker(directory)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="student@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=1, user_id=1, awareness_1=3))
+        db.session.add(User(id=2, email="new@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=2, user_id=2))
+        db.session.add(User(id=3, email="admin@pcos.research", password_hash="x", is_admin=True))
+        db.session.commit()
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+
+    def identity_queries():
+        return [sql for sql in statements if "FROM users" in sql]
+
+    def cached(user_id):
+        with app.app_context():
+            return identity_cache(app).get(user_id, report_cache.counter(IDENTITY_VERSION_KEY))
+
+    print("=" * 60)
+    print("Testing Identity Loader")
+    print("=" * 60)
+
+    client = login(app, 1)
+
+    # Step 1: one joined query loads user and profile, later requests hit the cache
+    print("\n1. Loading the identity...")
+    assert client.get("/submit").status_code == 200
+    assert len(identity_queries()) == 1 and "JOIN student_profiles" in identity_queries()[0]
+    with client.session_transaction() as sess:
+        assert sess[BASELINE_SESSION_KEY] == "1"
+    statements.clear()
+    assert client.get("/submit").status_code == 200
+    assert client.get("/submit").status_code == 200
+    assert identity_queries() == []
+    print("   ✓ One joined query, then served from the worker cache")
+
+    # Step 2: cached identities are real session objects, so writes persist
+    print("\n2. Writing through a cached identity...")
+    response = client.post("/submit", data={"fatigue": "4", "academic_year": "2024-2025",
+                                            "semester": "1st", "grading_period": "Midterm", "gpa": "1.5"})
+    assert response.status_code == 302
+    with app.app_context():
+        profile = db.session.get(StudentProfile, 1)
+        assert len(profile.survey_responses) == 1 and profile.aggregate.survey_count == 1
+    print("   ✓ Submission recorded against the cached profile")
+
+    # Step 3: a profile change drops the entry; the next request reloads it
+    print("\n3. Invalidating after a change...")
+    with app.app_context():
+        db.session.get(StudentProfile, 1).name = "Renamed"
+        db.session.commit()
+    assert cached(1) is None
+    statements.clear()
+    client.get("/submit")
+    assert len(identity_queries()) == 1
+    assert cached(1)[1]["name"] == "Renamed"
+    print("   ✓ Entry dropped on commit and reloaded once")
+
+    # Step 4: users without a baseline are still sent to profile setup
+    print("\n4. Baseline redirect...")
+    other = login(app, 2)
+    response = other.get("/submit")
+    assert response.status_code == 302 and "/profile_setup" in response.headers["Location"]
+    with other.session_transaction() as sess:
+        assert BASELINE_SESSION_KEY not in sess
+    print("   ✓ Redirected, and no baseline marker set")
+
+    # Step 5: a demotion committed by another worker applies on the next request
+    print("\n5. Changes made in another worker...")
+    admin = login(app, 3)
+    assert admin.get("/admin/import_jobs").status_code == 200
+    assert cached(3) is not None
+    other_worker = make_worker(directory)
+    with other_worker.app_context():
+        db.session.get(User, 3).is_admin = False
+        db.session.commit()
+    assert cached(3) is None
+    assert admin.get("/admin/import_jobs").status_code == 403
+    print("   ✓ Shared identity version dropped the stale entry")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_identity()
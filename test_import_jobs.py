@@ -0,0 +1,119 @@
+"""
+Test script for background CSV import jobs
+Uploads the bundled survey export and polls the job until it finishes
+"""
+
+import io
+import os
+import tempfile
+import time
+
+from app import jobs
+from app.extensions import db
+from app.models import User, StudentProfile, ImportJob
+from testing import login, make_app
+
+SOURCE_CSV = "cleaned_PCOS_Academic_Stress_Data (3).csv"
+SOURCE_XLSX = "cleaned_PCOS_Academic_Stress_Data (3).xlsx"
+
+
+def wait_for(client, url, timeout=30):
+    """Poll a job status URL until the job leaves the queued/running states."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(url).get_json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Job did not finish within {timeout}s")
+
+
+def test_import_jobs():
+    """Test that uploads return a job id at once and report progress."""
+    # Jobs run on their own thread, so the database is a file rather than in memory
+    tmp = tempfile.mkdtemp()
+    app = make_app(SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.join(tmp, "jobs.db"),
+                   IMPORT_UPLOAD_DIR=os.path.join(tmp, "uploads"))
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        db.session.commit()
+
+        client = login(app, 1)
+
+        print("=" * 60)
+        print("Testing Background Import Jobs")
+        print("=" * 60)
+
+        with open(SOURCE_CSV, "rb") as f:
+            data = f.read()
+
+        # Step 1: upload returns 202 with a job id
+        print("\n1. Submitting import...")
+        response = client.post("/admin/import_csv", data={"file": (io.BytesIO(data), "survey.csv")})
+        assert response.status_code == 202
+        result = response.get_json()
+        print(f"   ✓ Job {result['job_id']} queued")
+
+        # Step 2: polling reports completion and counters
+        print("\n2. Polling job status...")
+        job = wait_for(client, result["status_url"])
+        assert job["status"] == "completed", job
+        assert job["processed_rows"] == job["total_rows"]
+        assert job["created"] == StudentProfile.query.count() > 0
+        print(f"   ✓ {job['created']} created, {job['skipped']} skipped")
+
+        # Step 3: jobs are listed for page refreshes
+        listed = client.get("/admin/import_jobs").get_json()["jobs"]
+        assert listed[0]["id"] == result["job_id"]
+        print("   ✓ Job listed for resume after refresh")
+
+        # Step 4: small chunks are committed and reported one by one
+        print("\n3. Re-importing in small chunks...")
+        jobs.IMPORT_CHUNK_SIZE = 50
+        try:
+            response = client.post("/admin/import_csv", data={"file": (io.BytesIO(data), "survey.csv")})
+            chunked = wait_for(client, response.get_json()["status_url"])
+        finally:
+            jobs.IMPORT_CHUNK_SIZE = 5000
+        assert chunked["status"] == "completed", chunked
+        assert [chunk["rows"] for chunk in chunked["chunks"]] == [50, 50, 50, 30]
+        print(f"   ✓ {len(chunked['chunks'])} chunks committed")
+
+        # Re-uploading the same export inserts nothing new
+        assert chunked["created"] == 0
+        assert sum(chunk["duplicates"] for chunk in chunked["chunks"]) == chunked["duplicates"] == job["created"]
+        assert StudentProfile.query.count() == job["created"]
+        print(f"   ✓ Re-import found {chunked['duplicates']} rows already present")
+
+        # Step 5: the Excel copy of the export maps to the same rows
+        print("\n4. Importing the .xlsx workbook...")
+        with open(SOURCE_XLSX, "rb") as f:
+            response = client.post("/admin/import_csv", data={"file": (io.BytesIO(f.read()), "survey.xlsx")})
+        assert response.status_code == 202
+        excel = wait_for(client, response.get_json()["status_url"])
+        assert excel["status"] == "completed", excel
+        assert excel["processed_rows"] == 180
+        assert excel["created"] == 0 and excel["duplicates"] == job["created"]
+        print(f"   ✓ {excel['duplicates']} rows matched the CSV import")
+
+        assert client.post("/admin/import_csv", data={"file": (io.BytesIO(b"x"), "survey.xls")}).status_code == 400
+        print("   ✓ Unsupported extensions rejected")
+
+        # Step 6: a cancelled queued job never runs
+        print("\n5. Cancelling a queued job...")
+        job = ImportJob(user_id=1, filename="cancel.csv")
+        db.session.add(job)
+        db.session.commit()
+        cancelled = client.post(f"/admin/import_jobs/{job.id}/cancel").get_json()
+        assert cancelled["status"] == "cancelled"
+        print("   ✓ Job cancelled")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_import_jobs()
@@ -0,0 +1,87 @@
+"""
+Test script for lazy startup
+Checks that create_app leaves the analytics stacks unimported, that the
+dashboard mounts on its first request, and that the main app's request
+checks still apply to it
+"""
+
+import subprocess
+import sys
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.identity import BASELINE_SESSION_KEY, identity_cache
+from app.models import User, StudentProfile
+from bench_startup import CHECK, DEFERRED_MODULES
+from testing import login, make_app
+
+
+def test_lazy_startup():
+    """Test deferred imports and the first dashboard request."""
+    print("=" * 60)
+    print("Testing Lazy Startup")
+    print("=" * 60)
+
+    # Step 1: a fresh worker imports none of the heavy modules
+    print("\n1. Importing the app in a fresh interpreter...")
+    code = CHECK.format(modules=DEFERRED_MODULES) + """
+client = app.test_client()
+client.get("/")
+print(",".join(m for m in {modules!r} if m in sys.modules))
+assert client.get("/dashboard/").status_code == 200
+assert client.get("/dashboard/_dash-dependencies").status_code == 200
+print(",".join(m for m in {modules!r} if m in sys.modules))
+""".format(modules=DEFERRED_MODULES)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    at_startup, after_index, after_dashboard = result.stdout.splitlines()
+    assert at_startup == "" and after_index == ""
+    print("   ✓ None of " + ", ".join(DEFERRED_MODULES) + " loaded at startup or by the index page")
+
+    # Step 2: the first dashboard request mounted Dash
+    print("\n2. Opening the dashboard...")
+    assert "dash" in after_dashboard.split(",")
+    assert "scipy" not in after_dashboard.split(",")
+    print(f"   ✓ Dashboard served; loaded {after_dashboard}")
+
+    # Step 3: the main app's baseline check still guards the dashboard
+    print("\n3. Dashboard with an incomplete baseline...")
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="student@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=1, user_id=1))
+        db.session.commit()
+
+    client = login(app, 1)
+    response = client.get("/dashboard/")
+    assert response.status_code == 302 and response.headers["Location"].endswith("/profile_setup")
+    assert app.extensions["dashboard"].dashboard is None
+
+    with app.app_context():
+        db.session.get(StudentProfile, 1).awareness_1 = 3
+        db.session.commit()
+    assert client.get("/dashboard/").status_code == 200
+    with client.session_transaction() as sess:
+        assert sess[BASELINE_SESSION_KEY] == "1"
+    print("   ✓ Redirected to profile setup until the baseline is complete")
+
+    # Step 4: the marker saved from a dashboard request spares the next one the profile lookup
+    print("\n4. Dashboard with the baseline marker...")
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+        identity_cache().clear()
+    assert client.get("/dashboard/").status_code == 200
+    assert not [sql for sql in statements if "FROM users" in sql or "FROM student_profiles" in sql]
+    print("   ✓ No user or profile query for a marked session")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_lazy_startup()
@@ -0,0 +1,94 @@
+"""
+Test script for per-profile running aggregates
+Submits data through the form and checks the aggregates against the raw records
+"""
+
+from datetime import datetime
+
+from app.aggregates import rebuild, record_surveys
+from app.extensions import db
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse, ProfileAggregate
+from app.queries import profile_feature_frame
+from testing import login, make_app
+
+
+def submit(client, **fields):
+    form = {"academic_year": "2024-2025", "semester": "1st", "grading_period": "Midterm", **fields}
+    response = client.post("/submit", data=form)
+    assert response.status_code == 302 and response.location.endswith("/submit")
+
+
+def test_profile_aggregates():
+    """Test incremental updates, reads, rebuild drift detection and delete cascade."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        db.session.add(StudentProfile(id=1, user_id=1, name="Admin", awareness_1=3, pcos_awareness_score=3))
+        db.session.commit()
+
+        client = login(app, 1)
+
+        print("=" * 60)
+        print("Testing Profile Aggregates")
+        print("=" * 60)
+
+        # Step 1: each submission updates the aggregate row in the same commit
+        print("\n1. Submitting data...")
+        submit(client, gpa="2.0", attendance="90", fatigue="2", stress="4")
+        submit(client, gpa="3.0", fatigue="4", stress="5")
+        submit(client, academic_year="", fatigue="3")
+
+        aggregate = db.session.get(ProfileAggregate, 1)
+        assert aggregate.academic_count == 2 and aggregate.survey_count == 3
+        assert aggregate.mean("gpa") == 2.5
+        assert aggregate.mean("attendance") == 90  # zero (blank) attendance is skipped
+        assert aggregate.mean("fatigue") == 3 and aggregate.mean("stress") == 4.5
+        assert aggregate.mean("sleep") is None
+        assert aggregate.last_survey_at == db.session.query(db.func.max(SurveyResponse.date)).scalar()
+        print("   ✓ Counts, sums and last-seen timestamps updated")
+
+        # Step 2: readers use the precomputed values
+        print("\n2. Reading means...")
+        features = profile_feature_frame()
+        assert features.at[1, "gpa"] == 2.5 and features.at[1, "fatigue"] == 3
+        assert client.get("/my-dashboard").status_code == 200
+        print("   ✓ Feature frame and dashboard read the aggregates")
+
+        # Step 3: rebuild reports drift and repairs it
+        print("\n3. Checking drift...")
+        assert rebuild(write=False) == []
+        db.session.add(SurveyResponse(profile_id=1, fatigue=5))
+        db.session.commit()
+        drift = rebuild(write=False)
+        assert any("fatigue_sum" in line for line in drift), drift
+        assert rebuild() == drift and rebuild(write=False) == []
+        assert db.session.get(ProfileAggregate, 1).survey_count == 4
+        print(f"   ✓ {len(drift)} drifted values found and rebuilt")
+
+        # Step 4: plain dict rows, as bulk writers pass them
+        db.session.add(User(id=2, email="student@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=2, user_id=2))
+        db.session.flush()
+        row = {"profile_id": 2, "date": datetime(2025, 1, 6), "fatigue": 1, "mood_swings": 0}
+        record_surveys([row])
+        db.session.add(SurveyResponse(**row))
+        db.session.commit()
+        assert rebuild(write=False) == []
+
+        # Step 5: deleting a profile removes its aggregate row
+        print("\n4. Deleting a profile...")
+        db.session.delete(db.session.get(StudentProfile, 2))
+        db.session.commit()
+        assert db.session.get(ProfileAggregate, 2) is None
+        assert AcademicRecord.query.filter_by(profile_id=2).count() == 0
+        print("   ✓ Aggregate row deleted with the profile")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_profile_aggregates()
@@ -0,0 +1,134 @@
+"""
+Test script for the profile data API
+Checks cursor pagination, field projection, the since filter, conditional
+requests, and that pages are read through the composite indexes
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, update
+
+from app import aggregates
+from app.extensions import db
+from app.models import User, StudentProfile, AcademicRecord, SurveyResponse, ProfileAggregate
+from testing import login, make_app
+
+
+def test_profile_data():
+    """Test paging, projection, filtering and 304 responses."""
+    app = make_app()
+    start = datetime(2022, 1, 1, 8)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="student@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=1, user_id=1, awareness_1=3))
+        db.session.add(User(id=2, email="other@pcos.research", password_hash="x"))
+        db.session.add(StudentProfile(id=2, user_id=2, awareness_1=3))
+        # Two surveys share each date, so pages have to break ties by id
+        db.session.execute(insert(SurveyResponse), [
+            {"profile_id": profile_id, "date": start + timedelta(days=day // 2), "fatigue": day % 5 + 1, "mood_swings": 2}
+            for profile_id in (1, 2) for day in range(250)
+        ])
+        db.session.execute(insert(AcademicRecord), [
+            {"profile_id": 1, "term": f"Term {i}", "gpa": 1.5, "created_at": start + timedelta(days=30 * i)}
+            for i in range(30)
+        ])
+        db.session.commit()
+        aggregates.rebuild()
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, params, *args: statements.append((sql, params)))
+
+    client = login(app, 1)
+
+    print("=" * 60)
+    print("Testing Profile Data API")
+    print("=" * 60)
+
+    # Step 1: cursors walk every record once, in order
+    print("\n1. Paging through the records...")
+    surveys, academics, cursor, pages = [], [], None, 0
+    while True:
+        response = client.get("/api/profile/1/data", query_string={"limit": 100, "cursor": cursor or ""})
+        assert response.status_code == 200
+        page = response.get_json()
+        surveys += page["surveys"]
+        academics += page["academics"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3 and len(surveys) == 250 and len(academics) == 30
+    assert [s["fatigue"] for s in surveys] == [day % 5 + 1 for day in range(250)]  # (date, id) order, no repeats
+    assert [a["term"] for a in academics] == [f"Term {i}" for i in range(30)]
+    print(f"   ✓ {len(surveys)} surveys and {len(academics)} records in {pages} pages")
+
+    # Step 2: the page query is a range scan of the (profile_id, date) index
+    print("\n2. Checking the query plan...")
+    with app.app_context():
+        sql, params = next((sql, params) for sql, params in reversed(statements)
+                           if "FROM survey_responses" in sql and "LIMIT" in sql)
+        plan = " ".join(row[-1] for row in db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params))
+        assert "ix_survey_responses_profile_id_date" in plan and "TEMP B-TREE" not in plan
+    print(f"   ✓ {plan}")
+
+    # Step 3: fields= and since= narrow the response
+    print("\n3. Projection and since filter...")
+    page = client.get("/api/profile/1/data?fields=date,fatigue&since=2022-04-01&limit=1000").get_json()
+    assert set(page) == {"surveys", "next_cursor"} and set(page["surveys"][0]) == {"date", "fatigue"}
+    assert len(page["surveys"]) == 250 - 2 * 90 and page["surveys"][0]["date"] == "2022-04-01T08:00:00"
+    # 13:00 at +05:00 is the 08:00 UTC the records are stored in
+    offset = client.get("/api/profile/1/data", query_string={"fields": "date,fatigue", "limit": 1000,
+                                                              "since": "2022-04-01T13:00:00+05:00"}).get_json()
+    assert offset["surveys"] == page["surveys"]
+    for query in ("fields=gpa,colour", "cursor=not-a-cursor", "limit=0", "since=yesterday"):
+        assert client.get(f"/api/profile/1/data?{query}").status_code == 400
+    assert client.get("/api/profile/99/data").status_code == 404
+    print("   ✓ Only requested fields and dates returned; bad parameters rejected")
+
+    # Step 4: polling with the ETag gets 304 until the profile's data changes
+    print("\n4. Conditional requests...")
+    first = client.get("/api/profile/1/data?fields=fatigue")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"] and "no-cache" in first.headers["Cache-Control"]
+    statements.clear()
+    again = client.get("/api/profile/1/data?fields=fatigue", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["ETag"] == etag
+    assert not [sql for sql, _ in statements if "FROM survey_responses" in sql]
+    assert client.get("/api/profile/1/data?fields=mood", headers={"If-None-Match": etag}).status_code == 200
+
+    with app.app_context():
+        survey = SurveyResponse(profile_id=1, date=datetime(2023, 1, 1), fatigue=3)
+        db.session.add(survey)
+        db.session.flush()
+        aggregates.record_surveys([survey])
+        db.session.commit()
+    changed = client.get("/api/profile/1/data?fields=fatigue", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    # A backdated record (e.g. buffered offline) still moves Last-Modified on
+    with app.app_context():
+        # As if the last write was a minute ago; Last-Modified is in whole seconds
+        db.session.execute(update(ProfileAggregate).values(updated_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.session.commit()
+    polled = client.get("/api/profile/1/data?fields=fatigue")
+    since = {"If-Modified-Since": polled.headers["Last-Modified"]}
+    assert client.get("/api/profile/1/data?fields=fatigue", headers=since).status_code == 304
+    with app.app_context():
+        survey = SurveyResponse(profile_id=1, date=datetime(2021, 6, 1), fatigue=4)
+        db.session.add(survey)
+        db.session.flush()
+        aggregates.record_surveys([survey])
+        db.session.commit()
+    assert client.get("/api/profile/1/data?fields=fatigue", headers=since).status_code == 200
+    print("   ✓ 304 without reading records; new data, even backdated, changes the validators")
+
+    print("\n" + "=" * 60)
+    print("✓ All tests passed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_profile_data()
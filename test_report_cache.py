@@ -0,0 +1,107 @@
+"""
+Test script for the shared report cache
+Checks version-keyed hits, invalidation on writes, LRU eviction, and the
+memoized Dash callback cache
+"""
+
+import os
+import time
+
+from app.cache import ReportCache
+from app.extensions import db, report_cache, callback_cache
+from app.models import User, StudentProfile
+from testing import login, make_app
+
+
+def test_report_cache():
+    """Test report caching across views and invalidation after writes."""
+    app = make_app(REPORT_CACHE_MAX_ENTRIES=3, WTF_CSRF_ENABLED=False)
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="admin@pcos.research", is_admin=True)
+        admin.set_password("admin")
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+
+        print("=" * 60)
+        print("Testing Report Cache")
+        print("=" * 60)
+
+        client = login(app, admin_id)
+
+        # Step 1: first view computes, second view is served from cache
+        print("\n1. Cache hit between writes...")
+        version = report_cache.data_version()
+        first = client.get("/admin/reports/preview-data").get_json()
+        assert report_cache.get("report_data", version=version) is not None
+        start = time.perf_counter()
+        second = client.get("/admin/reports/preview-data").get_json()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert first == second
+        assert first["summary"]["total_students"] == 0
+        print(f"   ✓ Cached preview served in {elapsed_ms:.1f} ms")
+
+        # Step 2: the reports page and PDF share the cached data
+        print("\n2. Reports page and PDF...")
+        assert client.get("/admin/reports").status_code == 200
+        pdf = client.get("/admin/reports/generate-pdf")
+        assert pdf.status_code == 200 and pdf.data.startswith(b"%PDF")
+        assert report_cache.get("report_pdf", version=version) is not None
+        print(f"   ✓ PDF cached ({len(pdf.data):,} bytes)")
+
+        # Step 3: a write bumps the version and invalidates the cache
+        print("\n3. Invalidation after write...")
+        student = User(email="student@pcos.research")
+        student.set_password("student")
+        db.session.add(student)
+        db.session.flush()
+        db.session.add(StudentProfile(user_id=student.id, clinical_diagnosis="Yes"))
+        db.session.commit()
+        report_cache.bump_version()
+        assert report_cache.data_version() == version + 1
+        assert report_cache.get("report_data") is None
+        third = client.get("/admin/reports/preview-data").get_json()
+        assert third["summary"]["total_students"] == 1
+        print("   ✓ New data visible after version bump")
+
+        # Step 4: entry count never exceeds the configured bound
+        print("\n4. LRU eviction...")
+        for i in range(10):
+            report_cache.set(f"filler_{i}", i)
+        assert report_cache.get("filler_9") == 9
+        assert report_cache.get("filler_0") is None
+        print("   ✓ Oldest entries evicted")
+
+        # Step 5: memoized callbacks hit across workers until a write or the TTL
+        print("\n5. Callback memoization...")
+        assert os.path.dirname(callback_cache.path) == os.path.dirname(report_cache.path)
+        other_worker = ReportCache(config_prefix="CALLBACK_CACHE", version_source=report_cache)
+        other_worker.init_app(app)
+        calls = []
+
+        def view(window):
+            calls.append(window)
+            return {"window": window, "version": report_cache.data_version()}
+
+        first_view = callback_cache.memoize("view")(view)
+        second_view = other_worker.memoize("view")(view)
+        assert first_view(["2024-01-01", None]) == second_view(["2024-01-01", None])
+        assert second_view(None) and len(calls) == 2
+        report_cache.bump_version()
+        assert first_view(None)["version"] == version + 2 and len(calls) == 3
+
+        callback_cache.set("short", 1, ttl=0.05)
+        assert other_worker.get("short") == 1
+        time.sleep(0.1)
+        assert other_worker.get("short") is None
+        print("   ✓ Shared between workers; new version and TTL force recompute")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_report_cache()
@@ -0,0 +1,112 @@
+"""
+Test script for the survey rollup table
+Checks trend averages from the rollups against the raw survey responses
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.extensions import db
+from app.models import User, StudentProfile, SurveyResponse, SurveyRollup
+from app.queries import monthly_survey_averages
+from app.rollups import period_start, rebuild, record_surveys
+from testing import login, make_app
+
+
+def add_surveys(count, seed=3):
+    """Add random surveys over ~5 months through the rollup write path."""
+    rng = np.random.default_rng(seed)
+    responses = [SurveyResponse(
+        profile_id=int(rng.integers(2, 6)),
+        date=datetime(2025, 1, 1) + timedelta(days=int(rng.integers(0, 150)), hours=int(rng.integers(0, 24))),
+        fatigue=int(rng.integers(0, 6)), mood_swings=int(rng.integers(0, 6)),
+        sleep_quality=int(rng.integers(0, 6)), perceived_academic_stress=int(rng.integers(0, 6)),
+    ) for _ in range(count)]
+    db.session.add_all(responses)
+    db.session.flush()
+    record_surveys(responses)
+    db.session.commit()
+
+
+def raw_monthly_averages():
+    """Monthly non-zero means straight from survey_responses."""
+    frame = pd.read_sql(db.session.query(SurveyResponse).statement, db.engine)
+    frame = frame.replace(0, np.nan).assign(month=pd.to_datetime(frame["date"]).dt.to_period("M"))
+    return frame.groupby("month")[["fatigue", "mood_swings", "perceived_academic_stress", "sleep_quality"]].mean()
+
+
+def test_survey_rollups():
+    """Test rollup maintenance on add, diagnosis change and delete, plus rebuild."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        for i, diagnosis in enumerate(["Yes", "No", None, "Yes"], start=2):
+            db.session.add(User(id=i, email=f"student{i}@pcos.research", password_hash="x"))
+            db.session.add(StudentProfile(id=i, user_id=i, clinical_diagnosis=diagnosis))
+        db.session.commit()
+
+        client = login(app, 1)
+
+        print("=" * 60)
+        print("Testing Survey Rollups")
+        print("=" * 60)
+
+        # Step 1: period boundaries
+        print("\n1. Checking period starts...")
+        moment = datetime(2025, 3, 13, 17, 30)  # a Thursday
+        assert period_start(moment, "day") == date(2025, 3, 13)
+        assert period_start(moment, "week") == date(2025, 3, 10)
+        assert period_start(moment, "month") == date(2025, 3, 1)
+        print("   ✓ Day, Monday-start week and month")
+
+        # Step 2: monthly trends from the rollups match the raw table
+        print("\n2. Comparing monthly trends with raw surveys...")
+        add_surveys(400)
+        expected = raw_monthly_averages()
+        trends = monthly_survey_averages()
+        assert len(trends) == len(expected) == 5
+        for (year, month, *means), (_, row) in zip(trends, expected.iterrows()):
+            assert np.allclose(means, row.to_numpy())
+        assert db.session.query(SurveyRollup).filter_by(granularity="month").count() == 5 * 3
+        assert rebuild(write=False) == []
+        print(f"   ✓ {len(trends)} months match; rollups in sync")
+
+        # Step 3: a diagnosis change moves the profile's surveys between groups
+        print("\n3. Changing a diagnosis...")
+        response = client.post("/admin/profile/4/update", data={"clinical_diagnosis": "Yes"})
+        assert response.status_code == 302
+        labels = {label for (label,) in db.session.query(SurveyRollup.diagnosis).distinct()}
+        assert labels == {"Yes", "No"}
+        assert rebuild(write=False) == []
+        print("   ✓ Surveys moved from Not Specified to Yes")
+
+        # Step 4: deleting a profile takes its surveys out
+        print("\n4. Deleting a profile...")
+        response = client.post("/admin/profile/3/delete")
+        assert response.status_code == 302
+        labels = {label for (label,) in db.session.query(SurveyRollup.diagnosis).distinct()}
+        assert labels == {"Yes"}
+        assert rebuild(write=False) == []
+        assert np.allclose([m for *_, m in monthly_survey_averages()],
+                           raw_monthly_averages()["sleep_quality"].to_numpy())
+        print("   ✓ Rollup rows for the deleted profile removed")
+
+        # Step 5: rebuild finds and repairs writes that bypassed the rollups
+        print("\n5. Checking drift...")
+        db.session.add(SurveyResponse(profile_id=2, date=datetime(2025, 9, 1), fatigue=4))
+        db.session.commit()
+        drift = rebuild(write=False)
+        assert drift and rebuild() == drift and rebuild(write=False) == []
+        print(f"   ✓ {len(drift)} drifted values found and rebuilt")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_survey_rollups()
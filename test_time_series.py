@@ -0,0 +1,131 @@
+"""
+Test script for the aggregated dashboard time series
+Checks per-period statistics against pandas and the Dash series store callbacks
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+
+from app.dash_app import series_resolution, visible_range
+from app.extensions import db, report_cache
+from app.models import User, StudentProfile, SurveyResponse
+from app.queries import survey_series
+from testing import login, make_app
+
+
+def call_update_series(client, relayout_data=None, store=None, changed="."):
+    """POST one update_series call to Dash; returns (status, store)."""
+    payload = {
+        "output": "series-store.data",
+        "outputs": {"id": "series-store", "property": "data"},
+        "inputs": [
+            {"id": "time-series", "property": "relayoutData", "value": relayout_data},
+            {"id": "series-refresh", "property": "n_intervals", "value": 1},
+        ],
+        "changedPropIds": [changed],
+        "state": [{"id": "series-store", "property": "data", "value": store}],
+    }
+    response = client.post("/dashboard/_dash-update-component", json=payload)
+    if response.status_code != 200:
+        return response.status_code, None
+    return 200, json.loads(response.get_data())["response"]["series-store"]["data"]
+
+
+def test_time_series():
+    """Test statistics, resolution choice and the callback output."""
+    app = make_app()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, email="admin@pcos.research", password_hash="x", is_admin=True))
+        db.session.add(StudentProfile(id=1, user_id=1, awareness_1=3))
+
+        rng = np.random.default_rng(11)
+        start = datetime(2024, 1, 1)
+        rows = [{
+            "profile_id": 1,
+            "date": start + timedelta(minutes=int(rng.integers(0, 600 * 24 * 60))),
+            "fatigue": int(rng.integers(0, 6)),
+        } for _ in range(20000)]
+        db.session.execute(insert(SurveyResponse), rows)
+        db.session.commit()
+
+        print("=" * 60)
+        print("Testing Aggregated Time Series")
+        print("=" * 60)
+
+        # Step 1: statistics from value counts match pandas on the raw rows
+        print("\n1. Comparing with pandas...")
+        raw = pd.DataFrame(rows)
+        raw = raw[raw["fatigue"] != 0]
+        for resolution, frequency in (("day", "D"), ("week", "W-SUN"), ("month", "M")):
+            series = survey_series(SurveyResponse.fatigue, resolution)
+            grouped = raw.groupby(raw["date"].dt.to_period(frequency).dt.start_time)["fatigue"]
+            assert np.array_equal(series.index, grouped.size().index)
+            assert np.array_equal(series["n"], grouped.size())
+            assert np.allclose(series["mean"], grouped.mean())
+            assert np.allclose(series["median"], grouped.median())
+            assert np.allclose(series["q1"], grouped.quantile(0.25))
+            assert np.allclose(series["q3"], grouped.quantile(0.75))
+            print(f"   ✓ {resolution}: {len(series)} periods match")
+
+        window = survey_series(SurveyResponse.fatigue, "day", datetime(2024, 3, 1), datetime(2024, 3, 31, 23, 59))
+        assert len(window) == 31 and window.index.min() == pd.Timestamp(2024, 3, 1)
+
+        # Step 2: resolution follows the visible range
+        print("\n2. Checking resolution choice...")
+        assert visible_range(None) is None and visible_range({"autosize": True}) is None
+        assert visible_range({"xaxis.range[0]": "2024-03-01", "xaxis.range[1]": "2024-04-01 12:00:00.5"}) == (
+            pd.Timestamp(2024, 3, 1), pd.Timestamp("2024-04-01 12:00:00.5"))
+        assert series_resolution("2024-03-01", "2024-04-01") == "day"
+        assert series_resolution("2024-01-01", "2024-12-31") == "week"
+        assert series_resolution("2020-01-01", "2024-12-31") == "month"
+        print("   ✓ Daily up to ~4 months, weekly up to ~3 years, then monthly")
+
+        # Step 3: one store load carries every metric
+        print("\n3. Loading the series store...")
+        client = login(app, 1)
+
+        status, store = call_update_series(client)
+        weeks = survey_series(SurveyResponse.fatigue, "week")
+        assert status == 200 and store["resolution"] == "week" and store["window"] is None
+        assert set(store["metrics"]) == {"fatigue", "mood_swings", "perceived_academic_stress"}
+        assert store["metrics"]["fatigue"]["series"]["x"] == weeks.index.strftime("%Y-%m-%d").tolist()
+        assert np.allclose(store["metrics"]["fatigue"]["series"]["median"], weeks["median"])
+        assert store["metrics"]["mood_swings"]["series"]["x"] == []  # never answered in this data
+        size = len(json.dumps(store))
+        print(f"   ✓ {len(weeks)} weekly points per metric, {size / 1024:.1f} KB for all metrics")
+
+        status, zoomed = call_update_series(client, {"xaxis.range[0]": "2024-03-01", "xaxis.range[1]": "2024-03-31 23:59:59"},
+                                            changed="time-series.relayoutData")
+        assert zoomed["resolution"] == "day" and len(zoomed["metrics"]["fatigue"]["series"]["x"]) == 31
+        assert call_update_series(client, {"autosize": True}, store, changed="time-series.relayoutData")[0] == 204
+
+        # Step 4: timer refreshes fetch only rows past the cursor
+        print("\n4. Refreshing from the cursor...")
+        assert call_update_series(client, store=store, changed="series-refresh.n_intervals")[0] == 204
+        db.session.execute(insert(SurveyResponse), [
+            {"profile_id": 1, "date": datetime(2024, 3, 5), "fatigue": 5, "mood_swings": 2},
+            {"profile_id": 1, "date": datetime(2025, 9, 1), "fatigue": 1},
+        ])
+        db.session.commit()
+        report_cache.bump_version()
+        status, refreshed = call_update_series(client, store=store, changed="series-refresh.n_intervals")
+        assert refreshed["cursor"] == store["cursor"] + 2
+        assert refreshed == call_update_series(client)[1]
+        status, refreshed_zoom = call_update_series(client, store=zoomed, changed="series-refresh.n_intervals")
+        assert refreshed_zoom["metrics"]["fatigue"]["series"]["n"][4] == zoomed["metrics"]["fatigue"]["series"]["n"][4] + 1
+        assert len(refreshed_zoom["metrics"]["fatigue"]["series"]["x"]) == 31  # the 2025 row is outside the zoom
+        print("   ✓ New rows merged into the stored counts; nothing new returns no_update")
+
+        print("\n" + "=" * 60)
+        print("✓ All tests passed successfully!")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_time_series()
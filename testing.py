@@ -0,0 +1,37 @@
+"""
+Shared helpers for the test scripts
+Builds apps on throwaway databases and logs test clients in
+"""
+
+import os
+import tempfile
+
+from app import create_app
+from app.config import Config
+
+
+def make_app(**settings):
+    """
+    Create an app on an in-memory database with its own report cache file.
+
+    Args:
+        **settings: Config values to set on top of the test defaults,
+            e.g. WTF_CSRF_ENABLED=False
+
+    Returns:
+        Flask: The application
+    """
+    defaults = {
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "REPORT_CACHE_PATH": os.path.join(tempfile.mkdtemp(), "report_cache.sqlite"),
+    }
+    return create_app(type("TestConfig", (Config,), {**defaults, **settings}))
+
+
+def login(app, user_id):
+    """A test client whose session is logged in as the given user."""
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user_id)
+        sess["_fresh"] = True
+    return client